@@ -1,5 +1,6 @@
 import os
 import sys
+from datetime import timedelta
 
 import qdarktheme
 from PyQt5.QtWidgets import QApplication
@@ -17,22 +18,35 @@ def main():
     splash = LoadingScreen()
     splash.show()
 
+    # MAIN WINDOW, SHOWN AS SOON AS A FIRST DATABASE IS PUBLISHED
+    window = MainWindow(currentDirectory)
+
     # LOADING WORKER THREAD
     thread = QThread()
-    loader = TLELoaderWorker(dataDir)
+    updateInterval = timedelta(days=window.settings['DATA']['UPDATE_INTERNAL_DAYS'])
+    loader = TLELoaderWorker(dataDir, previewObjects=list(window.activeObjects), updateInterval=updateInterval)
     loader.moveToThread(thread)
     thread.started.connect(loader.run)
     loader.progress.connect(splash.setProgress)
     loader.status.connect(splash.setStatus)
 
+    def onDatabaseUpdated(db):
+        if window.tleDatabase is None:
+            window.setDatabase(db)
+            splash.launchMainWindow(window)
+            loader.status.connect(window.statusBar().showMessage)
+        else:
+            window.updateDatabase(db)
+
     def onFinished(db):
-        window = MainWindow(currentDirectory)
-        window.setDatabase(db)
-        splash.launchMainWindow(window)
+        onDatabaseUpdated(db)
+        window.statusBar().showMessage('Ready')
+        window.startAutoRefresh()
         thread.quit()
         loader.deleteLater()
         thread.deleteLater()
 
+    loader.databaseUpdated.connect(onDatabaseUpdated)
     loader.finished.connect(onFinished)
     thread.start()
     sys.exit(app.exec_())
@@ -0,0 +1,11 @@
+#version 120
+
+varying vec4 vColor;
+
+void main()
+{
+    float radius = 2.0 * length(gl_PointCoord - vec2(0.5));
+    if (radius > 1.0)
+        discard;
+    gl_FragColor = vec4(vColor.rgb, vColor.a * (1.0 - smoothstep(0.8, 1.0, radius)));
+}
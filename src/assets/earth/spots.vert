@@ -0,0 +1,11 @@
+#version 120
+
+attribute float spotSize;
+varying vec4 vColor;
+
+void main()
+{
+    vColor = gl_Color;
+    gl_PointSize = spotSize;
+    gl_Position = gl_ModelViewProjectionMatrix * gl_Vertex;
+}
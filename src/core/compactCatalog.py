@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from src.core.tleParser import TLE_LINE_LENGTH
+
+
+class CompactCatalog:
+    ELEMENT_COLUMNS = ('EPOCH', 'MEAN_MOTION', 'ECCENTRICITY', 'INCLINATION', 'RA_OF_ASC_NODE', 'ARG_OF_PERICENTER', 'MEAN_ANOMALY', 'BSTAR')
+
+    def __init__(self, noradIndices, elements, revolutions, tags, names, tleLines, tagNames):
+        # ROWS SORTED BY NORAD ID, LOOKED UP BY BINARY SEARCH
+        order = np.argsort(noradIndices, kind='stable')
+        self.noradIndices = np.ascontiguousarray(np.asarray(noradIndices)[order], dtype=np.int32)
+        self.elements = np.ascontiguousarray(np.asarray(elements)[order], dtype=np.float64)
+        self.revolutions = np.ascontiguousarray(np.asarray(revolutions)[order], dtype=np.int32)
+        self.tags = np.ascontiguousarray(np.asarray(tags)[order], dtype=np.uint32)
+        self.tagNames = list(tagNames)
+        self._nameData, self._nameOffsets = self._packStrings([names[i] for i in order])
+        self.tleLines = np.ascontiguousarray(np.asarray(tleLines, dtype=f'S{TLE_LINE_LENGTH}')[order])
+
+    @classmethod
+    def fromDataFrame(cls, dataFrame, tagNames):
+        return cls(dataFrame['NORAD_CAT_ID'].to_numpy(), dataFrame[list(cls.ELEMENT_COLUMNS)].to_numpy(dtype=np.float64),
+                   dataFrame['REV_AT_EPOCH'].to_numpy(), dataFrame['TAGS'].to_numpy(), dataFrame['OBJECT_NAME'].tolist(),
+                   dataFrame[['TLE_LINE1', 'TLE_LINE2']].to_numpy(dtype=str), tagNames)
+
+    @staticmethod
+    def _packStrings(strings):
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+    def __len__(self):
+        return self.noradIndices.size
+
+    def indexOf(self, noradIndex):
+        position = int(np.searchsorted(self.noradIndices, noradIndex))
+        if position < self.noradIndices.size and self.noradIndices[position] == noradIndex:
+            return position
+        return None
+
+    def indicesOf(self, noradIndices):
+        noradIndices = np.asarray(noradIndices)
+        if not self.noradIndices.size:
+            return np.full(noradIndices.shape, -1)
+        positions = np.minimum(np.searchsorted(self.noradIndices, noradIndices), self.noradIndices.size - 1)
+        return np.where(self.noradIndices[positions] == noradIndices, positions, -1)
+
+    def hasObject(self, noradIndex):
+        return self.indexOf(noradIndex) is not None
+
+    def _position(self, noradIndex):
+        position = self.indexOf(noradIndex)
+        if position is None:
+            raise KeyError(noradIndex)
+        return position
+
+    def nameAt(self, position):
+        return self._nameData[self._nameOffsets[position]:self._nameOffsets[position + 1]].tobytes().decode('utf-8')
+
+    def namesAt(self, positions):
+        data, positions = self._nameData.tobytes(), np.asarray(positions)
+        starts, stops = self._nameOffsets[positions].tolist(), self._nameOffsets[positions + 1].tolist()
+        return [data[start:stop].decode('utf-8') for start, stop in zip(starts, stops)]
+
+    def names(self):
+        return self.namesAt(np.arange(len(self)))
+
+    def getObjectName(self, noradIndex):
+        return self.nameAt(self._position(noradIndex))
+
+    def getTleLines(self, noradIndex):
+        line1, line2 = self.tleLines[self._position(noradIndex)]
+        return line1.decode('ascii'), line2.decode('ascii')
+
+    def getTags(self, noradIndex):
+        mask = int(self.tags[self._position(noradIndex)])
+        return [tag for bit, tag in enumerate(self.tagNames) if mask & (1 << bit)]
+
+    def hasTag(self, tag):
+        return (self.tags & np.uint32(1 << self.tagNames.index(tag))) != 0
+
+    def getRow(self, noradIndex):
+        position = self._position(noradIndex)
+        line1, line2 = self.tleLines[position]
+        row = {'OBJECT_NAME': self.nameAt(position), 'NORAD_CAT_ID': int(self.noradIndices[position])}
+        row.update(zip(self.ELEMENT_COLUMNS, self.elements[position].tolist()))
+        row.update({'REV_AT_EPOCH': int(self.revolutions[position]), 'TLE_LINE1': line1.decode('ascii'), 'TLE_LINE2': line2.decode('ascii'), 'TAGS': self.getTags(noradIndex)})
+        return row
+
+    def toDataFrame(self):
+        dataFrame = pd.DataFrame(self.elements, columns=list(self.ELEMENT_COLUMNS))
+        dataFrame.insert(0, 'NORAD_CAT_ID', self.noradIndices)
+        dataFrame.insert(0, 'OBJECT_NAME', self.names())
+        dataFrame['REV_AT_EPOCH'] = self.revolutions
+        dataFrame['TLE_LINE1'] = np.char.decode(self.tleLines[:, 0], 'ascii')
+        dataFrame['TLE_LINE2'] = np.char.decode(self.tleLines[:, 1], 'ascii')
+        dataFrame['TAGS'] = self.tags
+        return dataFrame
+
+    def memoryReport(self):
+        report = {'NORAD_CAT_ID': self.noradIndices.nbytes, 'ELEMENTS': self.elements.nbytes, 'REV_AT_EPOCH': self.revolutions.nbytes,
+                  'TAGS': self.tags.nbytes, 'NAMES': self._nameData.nbytes + self._nameOffsets.nbytes, 'TLE_LINES': self.tleLines.nbytes}
+        report['TOTAL'] = sum(report.values())
+        return report
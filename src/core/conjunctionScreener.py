@@ -0,0 +1,166 @@
+import numpy as np
+from datetime import datetime, timedelta
+from itertools import product
+from sgp4.api import SatrecArray
+
+from src.core.orbitalEngine import OrbitalMechanicsEngine
+
+
+class ConjunctionScreener:
+    # UNIFORM GRID : CELLS PER AXIS & HALF OF THE 27 NEIGHBOURING CELLS, EACH CELL PAIR VISITED ONCE
+    GRID_SIZE = 1 << 14
+    HALF_STENCIL = [offset for offset in product((-1, 0, 1), repeat=3) if offset > (0, 0, 0)]
+    NEWTON_ITERATIONS, TOLERANCE = 4, 1e-3  # SECONDS
+
+    def __init__(self, engine: OrbitalMechanicsEngine = None, threshold=5.0, step=30.0, maxChunkSamples=2_000_000):
+        self.engine = engine if engine is not None else OrbitalMechanicsEngine()
+        self.threshold = float(threshold)  # KM
+        self.step = float(step)
+        self.maxChunkSamples = maxChunkSamples
+
+    def _cellKeys(self, points, times, cellSize):
+        # ONE INTEGER PER (TIME, CELL X, CELL Y, CELL Z), CELLS CENTERED ON THE EARTH & CLAMPED TO THE GRID
+        cells = np.floor(points / cellSize).astype(np.int64) + self.GRID_SIZE // 2
+        cells = np.clip(cells, 1, self.GRID_SIZE - 2)
+        keys = times.astype(np.int64)
+        for axis in range(3):
+            keys = keys * self.GRID_SIZE + cells[:, axis]
+        return keys
+
+    @staticmethod
+    def _expandRanges(firsts, starts, stops):
+        # ONE (FIRST, SECOND) PAIR PER SECOND IN [START, STOP)
+        lengths = np.maximum(stops - starts, 0)
+        shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return np.repeat(firsts, lengths), np.arange(int(lengths.sum())) + shifts
+
+    def _neighbourPairs(self, points, times, cellSize):
+        # POINTS SORTED BY CELL KEY : EACH OCCUPIED CELL IS A CONTIGUOUS RANGE
+        keys = self._cellKeys(points, times, cellSize)
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        cellKeys, cellStarts, cellCounts = np.unique(keys, return_index=True, return_counts=True)
+        ranks = np.arange(keys.size)
+
+        # SAME CELL : ONLY THE POINTS SORTED AFTER EACH POINT
+        cellIndices = np.repeat(np.arange(cellKeys.size), cellCounts)
+        firsts, starts, stops = [ranks], [ranks + 1], [cellStarts[cellIndices] + cellCounts[cellIndices]]
+
+        # HALF STENCIL : EVERY POINT OF EACH OCCUPIED NEIGHBOURING CELL
+        for dx, dy, dz in self.HALF_STENCIL:
+            neighbourKeys = keys + (dx * self.GRID_SIZE + dy) * self.GRID_SIZE + dz
+            neighbours = np.minimum(np.searchsorted(cellKeys, neighbourKeys), cellKeys.size - 1)
+            found = cellKeys[neighbours] == neighbourKeys
+            neighbours = neighbours[found]
+            firsts.append(ranks[found])
+            starts.append(cellStarts[neighbours])
+            stops.append(cellStarts[neighbours] + cellCounts[neighbours])
+
+        firsts, seconds = self._expandRanges(np.concatenate(firsts), np.concatenate(starts), np.concatenate(stops))
+        return order[firsts], order[seconds]
+
+    def _linearApproach(self, relativePositions, relativeVelocities):
+        # CLOSEST APPROACH OF THE LINEAR RELATIVE MOTION, WITHIN HALF A STEP AROUND THE SAMPLE
+        speedsSquared = np.einsum('ij,ij->i', relativeVelocities, relativeVelocities)
+        delays = -np.einsum('ij,ij->i', relativePositions, relativeVelocities) / np.where(speedsSquared > 0, speedsSquared, np.inf)
+        delays = np.clip(delays, -0.5 * self.step, 0.5 * self.step)
+        missDistances = np.linalg.norm(relativePositions + relativeVelocities * delays[:, None], axis=-1)
+        return delays, missDistances
+
+    def _screenChunk(self, satelliteArray, offsets):
+        # VALID SAMPLES OF THE CHUNK, FLATTENED TO (SATELLITE, TIME) POINTS
+        fractions = self._fraction + offsets / 86400.0
+        positions, velocities, errors = self.engine.propagateSgp4Batch(satelliteArray, np.full(offsets.size, self._julianDate), fractions)
+        satIndices, times = np.nonzero((errors == 0) & np.isfinite(positions).all(axis=-1))
+        if not satIndices.size:
+            return None
+        points, pointVelocities = positions[satIndices, times], velocities[satIndices, times]
+
+        # ANY APPROACH BELOW THE THRESHOLD WITHIN HALF A STEP STARTS INSIDE THIS RADIUS
+        radius = self.threshold + np.linalg.norm(pointVelocities, axis=-1).max() * self.step
+        firsts, seconds = self._neighbourPairs(points, times, radius)
+        relativePositions = points[seconds] - points[firsts]
+        close = np.einsum('ij,ij->i', relativePositions, relativePositions) <= radius ** 2
+        firsts, seconds, relativePositions = firsts[close], seconds[close], relativePositions[close]
+
+        # LINEAR MOTION ERROR : TIDAL RELATIVE ACCELERATION (2 MU / R^3 PER KM OF SEPARATION) OVER HALF A STEP
+        delays, missDistances = self._linearApproach(relativePositions, pointVelocities[seconds] - pointVelocities[firsts])
+        tidalMargin = self.engine.earthGravParameter / self.engine.equatorialRadius ** 3 * radius * (0.5 * self.step) ** 2
+        close = missDistances <= self.threshold + tidalMargin
+        firsts, seconds, delays = firsts[close], seconds[close], delays[close]
+
+        # PAIRS ORDERED BY SATELLITE INDEX
+        pairs = np.sort(np.stack((satIndices[firsts], satIndices[seconds]), axis=-1), axis=-1)
+        return {'FIRST': pairs[:, 0], 'SECOND': pairs[:, 1], 'SAMPLE': times[firsts], 'TIME': offsets[times[firsts]] + delays}
+
+    def _screenWindow(self, satellites, offsets):
+        satelliteArray = SatrecArray(list(satellites))
+        chunkSize = max(1, self.maxChunkSamples // max(len(satellites), 1))
+        candidates = {'FIRST': [], 'SECOND': [], 'SAMPLE': [], 'TIME': []}
+        for first in range(0, offsets.size, chunkSize):
+            last = min(first + chunkSize, offsets.size)
+            chunk = self._screenChunk(satelliteArray, offsets[first:last])
+            if chunk is None:
+                continue
+            chunk['SAMPLE'] = chunk['SAMPLE'] + first
+            for key, column in chunk.items():
+                candidates[key].append(column)
+        return {key: np.concatenate(columns) if columns else np.zeros(0, dtype=np.float64 if key == 'TIME' else np.int64)
+                for key, columns in candidates.items()}
+
+    def _relativeState(self, satellites, firsts, seconds, offsets):
+        fractions = self._fraction + offsets / 86400.0
+        positions, velocities, errors = self.engine.propagateSgp4Events(satellites, np.concatenate((firsts, seconds)), self._julianDate, np.concatenate((fractions, fractions)))
+        count = firsts.size
+        failed = (errors[:count] != 0) | (errors[count:] != 0)
+        return positions[count:] - positions[:count], velocities[count:] - velocities[:count], failed
+
+    @staticmethod
+    def _groupEncounters(candidates):
+        # ONE ENCOUNTER PER RUN OF CONSECUTIVE FLAGGED SAMPLES OF A PAIR
+        order = np.lexsort((candidates['SAMPLE'], candidates['SECOND'], candidates['FIRST']))
+        candidates = {key: column[order] for key, column in candidates.items()}
+        firsts, seconds, samples = candidates['FIRST'], candidates['SECOND'], candidates['SAMPLE']
+        newEncounter = np.ones(firsts.size, dtype=bool)
+        newEncounter[1:] = (firsts[1:] != firsts[:-1]) | (seconds[1:] != seconds[:-1]) | (samples[1:] - samples[:-1] > 1)
+        candidates['ENCOUNTER'] = np.cumsum(newEncounter) - 1
+        return candidates
+
+    def _refineTimes(self, satellites, firsts, seconds, times, duration):
+        # TIME OF CLOSEST APPROACH : NEWTON ON THE RANGE RATE WITH THE RE-PROPAGATED RELATIVE STATE
+        active = np.arange(firsts.size)
+        for _ in range(self.NEWTON_ITERATIONS):
+            if not active.size:
+                break
+            relativePositions, relativeVelocities, _ = self._relativeState(satellites, firsts[active], seconds[active], times[active])
+            speedsSquared = np.einsum('ij,ij->i', relativeVelocities, relativeVelocities)
+            corrections = -np.einsum('ij,ij->i', relativePositions, relativeVelocities) / np.where(speedsSquared > 0, speedsSquared, np.inf)
+            times[active] = np.clip(times[active] + corrections, 0.0, duration)
+            active = active[np.abs(corrections) >= self.TOLERANCE]
+        return times
+
+    def screen(self, satellites, start: datetime, duration):
+        satellites = list(satellites)
+        duration = duration.total_seconds() if isinstance(duration, timedelta) else float(duration)
+        self._julianDate, self._fraction = self.engine.datetimeToJd(start)
+        startTime = np.datetime64(start.replace(tzinfo=None), 'us')
+        if len(satellites) < 2 or duration <= 0:
+            return {'FIRST': np.zeros(0, dtype=np.int64), 'SECOND': np.zeros(0, dtype=np.int64), 'TCA': np.zeros(0, dtype='datetime64[us]'),
+                    'MISS_DISTANCE': np.zeros(0), 'RELATIVE_SPEED': np.zeros(0)}
+        offsets = np.append(np.arange(0.0, duration, self.step), duration)
+        candidates = self._groupEncounters(self._screenWindow(satellites, offsets))
+        firsts, seconds, encounters = candidates['FIRST'], candidates['SECOND'], candidates['ENCOUNTER']
+
+        # REFINED APPROACH OF EVERY CANDIDATE
+        times = self._refineTimes(satellites, firsts, seconds, candidates['TIME'], duration)
+        relativePositions, relativeVelocities, failed = self._relativeState(satellites, firsts, seconds, times)
+        missDistances, relativeSpeeds = np.linalg.norm(relativePositions, axis=-1), np.linalg.norm(relativeVelocities, axis=-1)
+        missDistances[failed] = np.inf
+
+        # CLOSEST REFINED APPROACH OF EACH ENCOUNTER, WITHIN THE THRESHOLD
+        order = np.lexsort((missDistances, encounters))
+        closest = order[np.r_[True, encounters[order][1:] != encounters[order][:-1]]] if order.size else order
+        closest = closest[missDistances[closest] <= self.threshold]
+        closest = closest[np.argsort(times[closest], kind='stable')]
+        return {'FIRST': firsts[closest], 'SECOND': seconds[closest], 'TCA': startTime + np.round(times[closest] * 1e6).astype('timedelta64[us]'),
+                'MISS_DISTANCE': missDistances[closest], 'RELATIVE_SPEED': relativeSpeeds[closest]}
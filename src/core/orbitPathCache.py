@@ -0,0 +1,48 @@
+import numpy as np
+from sgp4.api import Satrec
+
+from src.core.orbitalEngine import OrbitalMechanicsEngine
+
+
+class OrbitPathCache:
+    def __init__(self, engine: OrbitalMechanicsEngine, nbPoints=361, nbPast=0.5, nbFuture=0.5):
+        self.engine = engine
+        self.nbPoints, self.nbPast, self.nbFuture = nbPoints, nbPast, nbFuture
+        self._entries = {}
+
+    @staticmethod
+    def _tleKey(sat: Satrec):
+        return sat.jdsatepoch, sat.jdsatepochF, sat.no_kozai
+
+    def _computeSamples(self, sat: Satrec, indices, step):
+        offsets = indices * step
+        positionsEci = self.engine.satelliteOrbitPathFromOffsets(sat, sat.jdsatepoch, sat.jdsatepochF, offsets)
+        longitudes, latitudes, altitudes = self.engine.groundTrackFromEci(positionsEci, sat.jdsatepoch, sat.jdsatepochF + offsets / 86400.0)
+        return {'ECI': positionsEci, 'LONGITUDE': longitudes, 'LATITUDE': latitudes, 'ALTITUDE': altitudes}
+
+    def getPath(self, noradIndex, sat: Satrec, julianDate, fraction):
+        orbitalPeriod = self.engine.orbitalPeriod(sat)
+        step = orbitalPeriod * (self.nbPast + self.nbFuture) / (self.nbPoints - 1)
+        secondsSinceEpoch = ((julianDate - sat.jdsatepoch) + (fraction - sat.jdsatepochF)) * 86400.0
+        firstIndex = int(np.ceil((secondsSinceEpoch - self.nbPast * orbitalPeriod) / step))
+        lastIndex = int(np.floor((secondsSinceEpoch + self.nbFuture * orbitalPeriod) / step))
+        entry = self._entries.get(noradIndex)
+        if entry is None or entry['KEY'] != self._tleKey(sat) or firstIndex > entry['LAST'] or lastIndex < entry['FIRST']:
+            # FULL WINDOW COMPUTATION
+            samples = self._computeSamples(sat, np.arange(firstIndex, lastIndex + 1, dtype=np.float64), step)
+        else:
+            # TRAILING EDGE REMOVAL AND LEADING EDGE EXTENSION
+            start, stop = max(firstIndex - entry['FIRST'], 0), min(lastIndex, entry['LAST']) - entry['FIRST'] + 1
+            samples = {key: values[start:stop] for key, values in entry['SAMPLES'].items()}
+            if firstIndex < entry['FIRST']:
+                before = self._computeSamples(sat, np.arange(firstIndex, entry['FIRST'], dtype=np.float64), step)
+                samples = {key: np.concatenate((before[key], samples[key])) for key in samples}
+            if lastIndex > entry['LAST']:
+                after = self._computeSamples(sat, np.arange(entry['LAST'] + 1, lastIndex + 1, dtype=np.float64), step)
+                samples = {key: np.concatenate((samples[key], after[key])) for key in samples}
+        self._entries[noradIndex] = {'KEY': self._tleKey(sat), 'FIRST': firstIndex, 'LAST': lastIndex, 'SAMPLES': samples}
+        return samples
+
+    def retain(self, noradIndices):
+        for noradIndex in set(self._entries) - set(noradIndices):
+            del self._entries[noradIndex]
@@ -1,6 +1,6 @@
 import numpy as np
 from datetime import datetime, timedelta
-from sgp4.api import Satrec, jday
+from sgp4.api import Satrec, SatrecArray, jday
 
 
 class OrbitalMechanicsEngine:
@@ -15,6 +15,12 @@ class OrbitalMechanicsEngine:
     def datetimeToJd(dt: datetime):
         return jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
 
+    @staticmethod
+    def datetimeToJdArray(dt: datetime, offsets=0.0):
+        julianDate, fraction = jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+        fractions = fraction + np.atleast_1d(np.asarray(offsets, dtype=np.float64)) / 86400.0
+        return np.full(fractions.shape, julianDate), fractions
+
     @staticmethod
     def datetimeToJulianCenturies(dt: datetime):
         return (dt - datetime(2000, 1, 1, 12, 0)) / timedelta(days=1) / 36525.0
@@ -30,25 +36,67 @@ class OrbitalMechanicsEngine:
             raise RuntimeError(f'SGP4 error code {error}')
         return np.array(r), np.array(v)
 
+    @staticmethod
+    def propagateSgp4Batch(satellites, julianDates, fractions=None):
+        satelliteArray = satellites if isinstance(satellites, SatrecArray) else SatrecArray(list(satellites))
+        julianDates = np.ascontiguousarray(np.atleast_1d(julianDates), dtype=np.float64)
+        if fractions is None:
+            fractions = np.zeros_like(julianDates)
+        fractions = np.ascontiguousarray(np.broadcast_to(fractions, julianDates.shape), dtype=np.float64)
+        errors, positions, velocities = satelliteArray.sgp4(julianDates, fractions)
+        return positions, velocities, errors
+
+    @staticmethod
+    def propagateSgp4Events(satellites, satIndices, julianDates, fractions):
+        # ONE TIME PER EVENT : ONE SGP4 CALL PER SATELLITE FOR ALL OF ITS EVENTS
+        satIndices = np.asarray(satIndices)
+        positions, velocities = np.zeros((satIndices.size, 3)), np.zeros((satIndices.size, 3))
+        errors = np.zeros(satIndices.size, dtype=np.uint8)
+        julianDates = np.ascontiguousarray(np.broadcast_to(julianDates, satIndices.shape), dtype=np.float64)
+        fractions = np.ascontiguousarray(np.broadcast_to(fractions, satIndices.shape), dtype=np.float64)
+        order = np.argsort(satIndices, kind='stable')
+        for group in np.split(order, np.flatnonzero(np.diff(satIndices[order])) + 1):
+            if group.size:
+                errors[group], positions[group], velocities[group] = satellites[satIndices[group[0]]].sgp4_array(julianDates[group], fractions[group])
+        return positions, velocities, errors
+
     def greenwichMeridianSiderealTime(self, dt: datetime):
         julianDate, fraction = self.datetimeToJd(dt)
-        julianDate += fraction
-        T = (julianDate - 2451545) / 36525
-        degGmst = (280.46061837 + 360.98564736629 * (julianDate - 2451545) + 0.000387933 * T ** 2 - T ** 3 / 38710000)
+        return self.julianDateToGmst(julianDate, fraction)
+
+    @staticmethod
+    def julianDateToGmst(julianDates, fractions=0.0):
+        daysSinceJ2000 = (np.asarray(julianDates, dtype=np.float64) - 2451545) + fractions
+        T = daysSinceJ2000 / 36525
+        degGmst = (280.46061837 + 360.98564736629 * daysSinceJ2000 + 0.000387933 * T ** 2 - T ** 3 / 38710000)
         return np.deg2rad(degGmst % 360)
 
-    def eciToEcef(self, rEci, dt: datetime):
-        gmstAngle = self.greenwichMeridianSiderealTime(dt)
-        rot = np.array([[np.cos(gmstAngle), np.sin(gmstAngle), 0], [-np.sin(gmstAngle), np.cos(gmstAngle), 0], [0, 0, 1]])
-        return rot @ rEci
+    @staticmethod
+    def rotateAboutZ(vectors, angles):
+        vectors = np.asarray(vectors, dtype=np.float64)
+        cosAngles, sinAngles = np.cos(angles), np.sin(angles)
+        x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+        return np.stack(np.broadcast_arrays(cosAngles * x + sinAngles * y, -sinAngles * x + cosAngles * y, z), axis=-1)
 
-    def ecefToEci(self, rEcef, dt: datetime):
-        gmstAngle = self.greenwichMeridianSiderealTime(dt)
-        rot = np.array([[np.cos(gmstAngle), -np.sin(gmstAngle), 0], [np.sin(gmstAngle), np.cos(gmstAngle), 0], [0, 0, 1]])
-        return rot @ rEcef
+    def timeToGmst(self, times):
+        if isinstance(times, datetime):
+            return self.greenwichMeridianSiderealTime(times)
+        times = np.asarray(times)
+        if np.issubdtype(times.dtype, np.datetime64):
+            return self.julianDateToGmst(2451545.0, (times - np.datetime64('2000-01-01T12:00:00')) / np.timedelta64(1, 'D'))
+        if times.dtype == object:
+            julianDates = np.array([self.datetimeToJd(t) for t in times.ravel()], dtype=np.float64).reshape(times.shape + (2,))
+            return self.julianDateToGmst(julianDates[..., 0], julianDates[..., 1])
+        return self.julianDateToGmst(times)
+
+    def eciToEcef(self, rEci, dt):
+        return self.rotateAboutZ(rEci, self.timeToGmst(dt))
+
+    def ecefToEci(self, rEcef, dt):
+        return self.rotateAboutZ(rEcef, -self.timeToGmst(dt))
 
     def ecefToLongitudeLatitude(self, rEcef, radians=True):
-        x, y, z = rEcef
+        x, y, z = np.moveaxis(np.asarray(rEcef, dtype=np.float64), -1, 0)
         longitude = np.arctan2(y, x)
         ep2 = (self.equatorialRadius ** 2 - self.polarRadius ** 2) / self.polarRadius ** 2
         p = np.sqrt(x * x + y * y)
@@ -71,28 +119,26 @@ class OrbitalMechanicsEngine:
         x = (N + altitude) * cosLatitude * cosLongitude
         y = (N + altitude) * cosLatitude * sinLongitude
         z = (N * (1 - self.e2Ellipsoid) + altitude) * sinLatitude
-        return np.array([x, y, z])
+        return np.stack(np.broadcast_arrays(x, y, z), axis=-1)
 
     def ecefToEnu(self, rEcef, obsLongitude, obsLatitude, obsAltitude, radians=True):
         if not radians:
             obsLongitude, obsLatitude = np.deg2rad(obsLongitude), np.deg2rad(obsLatitude)
         obsPosition = self.longitudeLatitudeToEcef(obsLongitude, obsLatitude, obsAltitude)
-        xDelta, yDelta, zDelta = rEcef - obsPosition
-        longitude, latitude = np.deg2rad(obsLongitude), np.deg2rad(obsLatitude)
-        cosLatitude, sinLatitude = np.cos(latitude), np.sin(latitude)
-        cosLongitude, sinLongitude= np.cos(longitude), np.sin(longitude)
-        rot = np.array([[-sinLongitude, cosLongitude, 0], [-sinLatitude * cosLongitude, -sinLatitude * sinLongitude, cosLatitude], [cosLatitude * cosLongitude, cosLatitude * sinLongitude, sinLatitude]])
-        enu = rot @ np.array([xDelta, yDelta, zDelta])
-        return enu
+        xDelta, yDelta, zDelta = np.moveaxis(np.asarray(rEcef, dtype=np.float64) - obsPosition, -1, 0)
+        cosLatitude, sinLatitude = np.cos(obsLatitude), np.sin(obsLatitude)
+        cosLongitude, sinLongitude= np.cos(obsLongitude), np.sin(obsLongitude)
+        east = -sinLongitude * xDelta + cosLongitude * yDelta
+        north = -sinLatitude * cosLongitude * xDelta - sinLatitude * sinLongitude * yDelta + cosLatitude * zDelta
+        up = cosLatitude * cosLongitude * xDelta + cosLatitude * sinLongitude * yDelta + sinLatitude * zDelta
+        return np.stack(np.broadcast_arrays(east, north, up), axis=-1)
 
     @staticmethod
     def enuToAzimuthElevation(enu):
-        E, N, U = enu
+        E, N, U = np.moveaxis(np.asarray(enu, dtype=np.float64), -1, 0)
         slantRange = np.sqrt(E ** 2 + N ** 2 + U ** 2)
         elevation = np.arcsin(U / slantRange)
-        azimuth = np.arctan2(E, N)
-        if azimuth < 0:
-            azimuth += 2 * np.pi
+        azimuth = np.arctan2(E, N) % (2 * np.pi)
         return azimuth, elevation, slantRange
 
     def satelliteState(self, sat: Satrec, dt: datetime, obsLongitude=None, obsLatitude=None, obsAltitude=None, radians=True):
@@ -122,22 +168,32 @@ class OrbitalMechanicsEngine:
     def satelliteOrbitPath(self, sat: Satrec, dt: datetime, nbPoints=361, nbPast=0.5, nbFuture=0.5):
         orbitalPeriod = self.orbitalPeriod(sat)
         times = np.linspace( - nbPast * orbitalPeriod, nbFuture * orbitalPeriod, nbPoints)
-        positionsEci = np.empty((nbPoints, 3))
-        for i, offset in enumerate(times):
-            t =  dt + timedelta(seconds=float(offset))
-            rEci, _ = self.propagateSgp4(sat, t)
-            positionsEci[i, :] = rEci
-        return positionsEci
+        julianDate, fraction = self.datetimeToJd(dt)
+        return self.satelliteOrbitPathFromOffsets(sat, julianDate, fraction, times)
 
     def satelliteGroundTrack(self, sat: Satrec, dt: datetime, nbPoints=361, nbPast=0.5, nbFuture=0.5):
         orbitalPeriod = self.orbitalPeriod(sat)
         times = np.linspace( - nbPast * orbitalPeriod, nbFuture * orbitalPeriod, nbPoints)
-        longitudes, latitudes, altitudes = np.empty(nbPoints), np.empty(nbPoints), np.empty(nbPoints)
-        for i, offset in enumerate(times):
-            t =  dt + timedelta(seconds=float(offset))
-            rEci, _ = self.propagateSgp4(sat, t)
-            rEcef = self.eciToEcef(rEci, t)
-            longitudes[i], latitudes[i], altitudes[i] = self.ecefToLongitudeLatitude(rEcef)
+        julianDate, fraction = self.datetimeToJd(dt)
+        return self.satelliteGroundTrackFromOffsets(sat, julianDate, fraction, times)
+
+    @staticmethod
+    def satelliteOrbitPathFromOffsets(sat: Satrec, julianDate, fraction, offsets):
+        fractions = fraction + np.asarray(offsets, dtype=np.float64) / 86400.0
+        julianDates = np.full(fractions.shape, julianDate, dtype=np.float64)
+        errors, positionsEci, _ = sat.sgp4_array(julianDates, fractions)
+        if np.any(errors):
+            raise RuntimeError(f'SGP4 error code {errors[np.flatnonzero(errors)[0]]}')
+        return positionsEci
+
+    def satelliteGroundTrackFromOffsets(self, sat: Satrec, julianDate, fraction, offsets):
+        fractions = fraction + np.asarray(offsets, dtype=np.float64) / 86400.0
+        positionsEci = self.satelliteOrbitPathFromOffsets(sat, julianDate, fraction, offsets)
+        return self.groundTrackFromEci(positionsEci, julianDate, fractions)
+
+    def groundTrackFromEci(self, positionsEci, julianDates, fractions=0.0):
+        positionsEcef = self.rotateAboutZ(positionsEci, self.julianDateToGmst(julianDates, fractions))
+        longitudes, latitudes, altitudes = self.ecefToLongitudeLatitude(positionsEcef)
         longitudes = (longitudes + np.pi) % (2 * np.pi) - np.pi
         return longitudes, latitudes, altitudes
 
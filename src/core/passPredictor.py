@@ -0,0 +1,298 @@
+import numpy as np
+from datetime import datetime, timedelta
+from sgp4.api import SatrecArray
+
+from src.core.orbitalEngine import OrbitalMechanicsEngine
+
+
+class PassPredictor:
+    EARTH_ROTATION_RATE = 7.2921150e-5  # RAD/S
+    # GEODETIC VS GEOCENTRIC VERTICAL & RADIUS VARIATION WITHIN A SAMPLING INTERVAL
+    VISIBILITY_SLACK = np.deg2rad(1.0)
+    NEWTON_ITERATIONS, TOLERANCE = 8, 1e-3  # SECONDS
+
+    def __init__(self, engine: OrbitalMechanicsEngine = None, step=240.0, minElevation=0.0, maxChunkSamples=2_000_000, radians=True):
+        self.engine = engine if engine is not None else OrbitalMechanicsEngine()
+        self.step = float(step)
+        self.minElevation = minElevation if radians else np.deg2rad(minElevation)
+        self.maxChunkSamples = maxChunkSamples
+        self.radians = radians
+
+    def _stationGeometry(self, stations):
+        longitudes, latitudes, altitudes = np.asarray(stations, dtype=np.float64).reshape(-1, 3).T
+        if not self.radians:
+            longitudes, latitudes = np.deg2rad(longitudes), np.deg2rad(latitudes)
+        positions = self.engine.longitudeLatitudeToEcef(longitudes, latitudes, altitudes)
+        ups = np.stack((np.cos(latitudes) * np.cos(longitudes), np.cos(latitudes) * np.sin(longitudes), np.sin(latitudes)), axis=-1)
+        return positions, ups
+
+    def _toEcef(self, rEci, vEci, gmst):
+        rEcef = self.engine.rotateAboutZ(rEci, gmst)
+        vEcef = self.engine.rotateAboutZ(vEci, gmst)
+        # TRANSPORT TERM OF THE ROTATING FRAME : - OMEGA x R
+        vEcef[..., 0] += self.EARTH_ROTATION_RATE * rEcef[..., 1]
+        vEcef[..., 1] -= self.EARTH_ROTATION_RATE * rEcef[..., 0]
+        return rEcef, vEcef
+
+    @staticmethod
+    def _observe(rEcef, vEcef, position, up):
+        relative = rEcef - position
+        slantRange = np.sqrt(np.einsum('...i,...i', relative, relative))
+        sinElevation = np.einsum('...i,...i', relative, up) / slantRange
+        rangeRate = np.einsum('...i,...i', relative, vEcef) / slantRange
+        # TIME DERIVATIVE OF SIN(ELEVATION), SAME SIGN AS THE ELEVATION RATE
+        elevationRate = (np.einsum('...i,...i', vEcef, up) - sinElevation * rangeRate) / slantRange
+        return sinElevation, elevationRate
+
+    def _evaluate(self, satellites, satIndices, stationIndices, offsets):
+        julianDates, fractions = np.full(offsets.size, self._julianDate), self._fraction + offsets / 86400.0
+        rEci, vEci, errors = self.engine.propagateSgp4Events(satellites, satIndices, julianDates, fractions)
+        failed = errors != 0
+        rEcef, vEcef = self._toEcef(rEci, vEci, self.engine.julianDateToGmst(julianDates, fractions))
+        sinElevation, elevationRate = self._observe(rEcef, vEcef, self._positions[stationIndices], self._ups[stationIndices])
+        sinElevation[failed], elevationRate[failed] = -2.0, np.nan
+        return sinElevation, elevationRate
+
+    @staticmethod
+    def _hermite(valuesBefore, ratesBefore, valuesAfter, ratesAfter, durations):
+        # CUBIC THROUGH BOTH SAMPLES & THEIR RATES, OVER THE NORMALIZED INTERVAL [0, 1]
+        slopesBefore, slopesAfter = ratesBefore * durations, ratesAfter * durations
+        return (valuesBefore, slopesBefore, 3 * (valuesAfter - valuesBefore) - 2 * slopesBefore - slopesAfter,
+                2 * (valuesBefore - valuesAfter) + slopesBefore + slopesAfter)
+
+    @staticmethod
+    def _polynomialRoot(coefficients, valuesBefore, valuesAfter):
+        # SAFEGUARDED NEWTON ON THE POLYNOMIAL, FROM THE LINEAR INTERPOLATION OF ITS SIGN CHANGE OVER [0, 1]
+        lower, upper = np.zeros(valuesBefore.shape), np.ones(valuesBefore.shape)
+        denominators = valuesBefore - valuesAfter
+        roots = np.clip(np.divide(valuesBefore, denominators, out=np.full(denominators.shape, 0.5), where=denominators != 0), 0, 1)
+        derivatives = [coefficient * power for power, coefficient in enumerate(coefficients)][1:]
+        for _ in range(8):
+            values = sum(coefficient * roots ** power for power, coefficient in enumerate(coefficients))
+            slopes = sum(coefficient * roots ** power for power, coefficient in enumerate(derivatives))
+            sameSide = (values < 0) == (valuesBefore < 0)
+            lower, upper = np.where(sameSide, roots, lower), np.where(sameSide, upper, roots)
+            roots = roots - np.divide(values, slopes, out=np.full(roots.shape, np.inf), where=slopes != 0)
+            roots = np.where((roots >= lower) & (roots <= upper), roots, 0.5 * (lower + upper))
+        return roots
+
+    def _refineRoots(self, satellites, satIndices, stationIndices, component, times, lower, upper, valuesLower, valuesUpper, threshold=0.0, slopes=None):
+        # SAFEGUARDED NEWTON WITHIN THE SHRINKING BRACKET, ONLY FOR THE ROOTS STILL MOVING BY MORE THAN THE TOLERANCE
+        # COMPONENT 0 : ROOT OF SIN(ELEVATION) - THRESHOLD, WITH THE ELEVATION RATE AS DERIVATIVE
+        # COMPONENT 1 : ROOT OF THE ELEVATION RATE, WITH THE INITIAL SLOPES THEN THE SECANT THROUGH THE LAST TWO ITERATES
+        sinElevations, elevationRates = np.zeros(times.size), np.zeros(times.size)
+        previousTimes, previousValues = np.full(times.size, np.nan), np.full(times.size, np.nan)
+        active = np.arange(times.size)
+        for _ in range(self.NEWTON_ITERATIONS):
+            if not active.size:
+                break
+            current = times[active]
+            sinElevations[active], elevationRates[active] = self._evaluate(satellites, satIndices[active], stationIndices[active], current)
+            values = np.nan_to_num((sinElevations if component == 0 else elevationRates)[active] - threshold)
+
+            # BRACKET UPDATE
+            sameSide = (values < 0) == (valuesLower[active] < 0)
+            lower[active] = np.where(sameSide, current, lower[active])
+            valuesLower[active] = np.where(sameSide, values, valuesLower[active])
+            upper[active] = np.where(sameSide, upper[active], current)
+            valuesUpper[active] = np.where(sameSide, valuesUpper[active], values)
+
+            # NEWTON STEP
+            if component == 0:
+                derivatives = elevationRates[active]
+            else:
+                derivatives = (values - previousValues[active]) / (current - previousTimes[active])
+                derivatives = np.where(np.isfinite(derivatives), derivatives, slopes[active])
+            previousTimes[active], previousValues[active] = current, values
+            estimates = current - values / np.where(derivatives != 0, derivatives, np.nan)
+            converged = (np.abs(estimates - current) < self.TOLERANCE) | (values == 0)
+            # OUTSIDE THE BRACKET OR UNDEFINED : BISECTION
+            outside = ~converged & ~((estimates >= lower[active]) & (estimates <= upper[active]))
+            estimates[outside] = 0.5 * (lower[active] + upper[active])[outside]
+            times[active] = np.where(values == 0, current, estimates)
+            active = active[~converged]
+        return times, sinElevations
+
+    @staticmethod
+    def _intervalSamples(station, first, satIndices, intervals, values, elevationRate):
+        # SAMPLES BOUNDING EACH (SATELLITE, INTERVAL) OF ONE STATION, INTERVALS NUMBERED OVER THE WHOLE WINDOW
+        return {'SATELLITE': satIndices, 'STATION': np.full(satIndices.size, station), 'INTERVAL': first + intervals,
+                'VALUE_BEFORE': values[satIndices, intervals], 'VALUE_AFTER': values[satIndices, intervals + 1],
+                'RATE_BEFORE': elevationRate[satIndices, intervals], 'RATE_AFTER': elevationRate[satIndices, intervals + 1]}
+
+    @staticmethod
+    def _concatenate(records):
+        return {key: np.concatenate([record[key] for record in records]) for key in records[0]}
+
+    @staticmethod
+    def _select(record, indices):
+        return {key: column[indices] for key, column in record.items()}
+
+    def _sampleWindow(self, satellites, offsets):
+        sinMinimum = np.sin(self.minElevation)
+        satelliteArray = SatrecArray(list(satellites))
+        nbStations = self._positions.shape[0]
+        geocentricRadii = np.linalg.norm(self._positions, axis=-1)
+        geocentricDirections = self._positions / geocentricRadii[:, None]
+        chunkSize = max(2, self.maxChunkSamples // max(len(satellites), 1))
+        crossings, peaks = [], []
+        for first in range(0, offsets.size - 1, chunkSize - 1):
+            # CONSECUTIVE CHUNKS SHARE THEIR BOUNDARY SAMPLE
+            last = min(first + chunkSize, offsets.size)
+            julianDates, fractions = np.full(last - first, self._julianDate), self._fraction + offsets[first:last] / 86400.0
+            rEci, vEci, errors = self.engine.propagateSgp4Batch(satelliteArray, julianDates, fractions)
+            rEcef, vEcef = self._toEcef(rEci, vEci, self.engine.julianDateToGmst(julianDates, fractions)[None, :])
+            failed = errors != 0
+            radii = np.linalg.norm(rEcef, axis=-1)
+            angularRates = np.linalg.norm(vEcef, axis=-1) / radii
+            durations = np.diff(offsets[first:last])
+            for station in range(nbStations):
+                sinElevation, elevationRate = self._observe(rEcef, vEcef, self._positions[station], self._ups[station])
+                values = sinElevation - sinMinimum
+                values[failed], elevationRate[failed] = -2.0, np.nan
+                before, after = values[:, :-1], values[:, 1:]
+
+                # RISING & SETTING CROSSINGS OF THE MINIMUM ELEVATION
+                for direction, mask in ((1, (before < 0) & (after >= 0)), (-1, (before >= 0) & (after < 0))):
+                    satIndices, intervals = np.nonzero(mask)
+                    crossing = self._intervalSamples(station, first, satIndices, intervals, values, elevationRate)
+                    crossing['DIRECTION'] = np.full(satIndices.size, direction)
+                    crossings.append(crossing)
+
+                # ELEVATION MAXIMA, KEPT ONLY WHERE THE HORIZON CIRCLE IS REACHABLE WITHIN THE INTERVAL
+                satIndices, intervals = np.nonzero((elevationRate[:, :-1] > 0) & (elevationRate[:, 1:] <= 0))
+                angles = np.arccos(np.clip(np.einsum('...i,i', rEcef[satIndices, intervals], geocentricDirections[station]) / radii[satIndices, intervals], -1, 1))
+                anglesAfter = np.arccos(np.clip(np.einsum('...i,i', rEcef[satIndices, intervals + 1], geocentricDirections[station]) / radii[satIndices, intervals + 1], -1, 1))
+                highestRadii = np.maximum(radii[satIndices, intervals], radii[satIndices, intervals + 1])
+                horizonAngles = np.arccos(np.clip(geocentricRadii[station] * np.cos(self.minElevation) / highestRadii, -1, 1)) - self.minElevation
+                travels = np.maximum(angularRates[satIndices, intervals], angularRates[satIndices, intervals + 1]) * durations[intervals]
+                reachable = 0.5 * (angles + anglesAfter - travels) <= horizonAngles + self.VISIBILITY_SLACK
+                peak = self._intervalSamples(station, first, satIndices[reachable], intervals[reachable], values, elevationRate)
+                peak['EDGE_TIME'] = np.full(reachable.sum(), np.nan)
+                peaks.append(peak)
+
+                # PASSES IN PROGRESS AT THE WINDOW EDGES CULMINATE AT THE EDGE WHEN RECEDING
+                edges = []
+                if first == 0:
+                    edges.append((np.flatnonzero((values[:, 0] >= 0) & (elevationRate[:, 0] <= 0)), 0, offsets[0]))
+                if last == offsets.size:
+                    edges.append((np.flatnonzero((values[:, -1] >= 0) & (elevationRate[:, -1] > 0)), values.shape[1] - 2, offsets[-1]))
+                for satIndices, interval, edgeTime in edges:
+                    peak = self._intervalSamples(station, first, satIndices, np.full(satIndices.size, interval), values, elevationRate)
+                    peak['EDGE_TIME'] = np.full(satIndices.size, edgeTime)
+                    peaks.append(peak)
+        return self._concatenate(crossings), self._concatenate(peaks)
+
+    @staticmethod
+    def _gather(values, indices):
+        return values[np.maximum(indices, 0)] if values.size else np.zeros(indices.size, dtype=values.dtype)
+
+    @staticmethod
+    def _adjacentCrossing(crossingKeys, selected, rows, keys, nbIntervals, previous):
+        # LAST SELECTED CROSSING AT OR BEFORE THE KEY, OR FIRST AT OR AFTER IT, WITHIN THE SAME (SATELLITE, STATION) ROW
+        candidates = np.flatnonzero(selected)
+        candidates = candidates[np.argsort(crossingKeys[candidates], kind='stable')]
+        sortedKeys = crossingKeys[candidates]
+        if not sortedKeys.size:
+            return np.full(rows.size, -1)
+        positions = np.searchsorted(sortedKeys, keys, side='right') - 1 if previous else np.searchsorted(sortedKeys, keys, side='left')
+        valid = (positions >= 0) & (positions < sortedKeys.size)
+        positions = np.clip(positions, 0, sortedKeys.size - 1)
+        return np.where(valid & (sortedKeys[positions] // nbIntervals == rows), candidates[positions], -1)
+
+    def _refinePeaks(self, satellites, peaks, offsets):
+        # CULMINATION : MAXIMUM OF THE HERMITE CUBIC, THEN ROOT OF THE PROPAGATED ELEVATION RATE
+        sinMinimum = np.sin(self.minElevation)
+        edgeTimes = peaks['EDGE_TIME']
+        inside = np.flatnonzero(np.isnan(edgeTimes))
+        intervals = peaks['INTERVAL'][inside]
+        starts, durations = offsets[intervals], offsets[intervals + 1] - offsets[intervals]
+        ratesBefore, ratesAfter = peaks['RATE_BEFORE'][inside], peaks['RATE_AFTER'][inside]
+        cubic = self._hermite(peaks['VALUE_BEFORE'][inside], ratesBefore, peaks['VALUE_AFTER'][inside], ratesAfter, durations)
+        fractions = self._polynomialRoot((cubic[1], 2 * cubic[2], 3 * cubic[3]), ratesBefore, ratesAfter)
+        curvatures = (2 * cubic[2] + 6 * cubic[3] * fractions) / durations ** 2
+
+        # PASSES CULMINATING AT A WINDOW EDGE KEEP THE EDGE SAMPLE
+        peakTimes = edgeTimes.copy()
+        peakValues = np.where(edgeTimes == offsets[-1], peaks['VALUE_AFTER'], peaks['VALUE_BEFORE'])
+        peakTimes[inside], sinElevations = self._refineRoots(satellites, peaks['SATELLITE'][inside], peaks['STATION'][inside], 1, starts + fractions * durations,
+                                                             starts, starts + durations, ratesBefore.copy(), ratesAfter.copy(), slopes=curvatures)
+        peakValues[inside] = sinElevations - sinMinimum
+        peaks['TIME'], peaks['VALUE'] = peakTimes, peakValues
+        return self._select(peaks, peakValues >= 0)
+
+    def _eventBracket(self, peaks, crossings, offsets, rising):
+        # WITHIN THE CULMINATION INTERVAL OR AT THE ADJACENT CROSSING, OTHERWISE CLIPPED TO THE WINDOW
+        insideInterval, adjacent = (peaks['RISES_INSIDE'], peaks['PREVIOUS_RISING']) if rising else (peaks['SETS_INSIDE'], peaks['NEXT_SETTING'])
+        adjacentIntervals = self._gather(crossings['INTERVAL'], adjacent)
+        intervals = peaks['INTERVAL']
+        if rising:
+            lower, upper = offsets[intervals], peaks['TIME']
+            lowerValues, upperValues, lowerRates, upperRates = peaks['VALUE_BEFORE'], peaks['VALUE'], peaks['RATE_BEFORE'], 0.0
+        else:
+            lower, upper = peaks['TIME'], offsets[intervals + 1]
+            lowerValues, upperValues, lowerRates, upperRates = peaks['VALUE'], peaks['VALUE_AFTER'], 0.0, peaks['RATE_AFTER']
+        bracket = {'SATELLITE': peaks['SATELLITE'], 'STATION': peaks['STATION'],
+                   'LOWER': np.where(insideInterval, lower, offsets[adjacentIntervals]),
+                   'UPPER': np.where(insideInterval, upper, offsets[adjacentIntervals + 1]),
+                   'LOWER_VALUE': np.where(insideInterval, lowerValues, self._gather(crossings['VALUE_BEFORE'], adjacent)),
+                   'UPPER_VALUE': np.where(insideInterval, upperValues, self._gather(crossings['VALUE_AFTER'], adjacent)),
+                   'LOWER_RATE': np.where(insideInterval, lowerRates, self._gather(crossings['RATE_BEFORE'], adjacent)),
+                   'UPPER_RATE': np.where(insideInterval, upperRates, self._gather(crossings['RATE_AFTER'], adjacent))}
+        refined = insideInterval | (adjacent >= 0)
+        return refined, self._select(bracket, refined)
+
+    @staticmethod
+    def _toDatetimes(startTime, times):
+        return startTime + np.round(times * 1e6).astype('timedelta64[us]')
+
+    def predict(self, satellites, stations, start: datetime, duration):
+        satellites = list(satellites)
+        duration = duration.total_seconds() if isinstance(duration, timedelta) else float(duration)
+        self._julianDate, self._fraction = self.engine.datetimeToJd(start)
+        self._positions, self._ups = self._stationGeometry(stations)
+        nbStations = self._positions.shape[0]
+        if not satellites or not nbStations or duration <= 0:
+            return {'SATELLITE': np.zeros(0, dtype=np.int64), 'STATION': np.zeros(0, dtype=np.int64), 'AOS': np.zeros(0, dtype='datetime64[us]'),
+                    'TCA': np.zeros(0, dtype='datetime64[us]'), 'LOS': np.zeros(0, dtype='datetime64[us]'), 'MAX_ELEVATION': np.zeros(0), 'DURATION': np.zeros(0)}
+        offsets = np.append(np.arange(0.0, duration, self.step), duration)
+        nbIntervals = offsets.size - 1
+        sinMinimum = np.sin(self.minElevation)
+        crossings, peaks = self._sampleWindow(satellites, offsets)
+        peaks = self._refinePeaks(satellites, peaks, offsets)
+
+        # CROSSINGS INDEXED BY (SATELLITE, STATION, INTERVAL) FOR THE ENCLOSING AOS & LOS OF EACH CULMINATION
+        rows = peaks['SATELLITE'] * nbStations + peaks['STATION']
+        crossingKeys = (crossings['SATELLITE'] * nbStations + crossings['STATION']) * nbIntervals + crossings['INTERVAL']
+        peaks['PREVIOUS_RISING'] = self._adjacentCrossing(crossingKeys, crossings['DIRECTION'] > 0, rows, rows * nbIntervals + peaks['INTERVAL'] - 1, nbIntervals, True)
+        peaks['NEXT_SETTING'] = self._adjacentCrossing(crossingKeys, crossings['DIRECTION'] < 0, rows, rows * nbIntervals + peaks['INTERVAL'] + 1, nbIntervals, False)
+        peaks['RISES_INSIDE'], peaks['SETS_INSIDE'] = peaks['VALUE_BEFORE'] < 0, peaks['VALUE_AFTER'] < 0
+
+        # SEVERAL CULMINATIONS WITHIN ONE VISIBILITY SPAN : KEEP THE HIGHEST
+        previousRisingIntervals = self._gather(crossings['INTERVAL'], peaks['PREVIOUS_RISING'])
+        aosIds = np.where(peaks['RISES_INSIDE'], peaks['INTERVAL'], np.where(peaks['PREVIOUS_RISING'] >= 0, previousRisingIntervals, -1))
+        order = np.lexsort((-peaks['VALUE'], aosIds, rows))
+        unique = np.ones(order.size, dtype=bool)
+        unique[1:] = (rows[order][1:] != rows[order][:-1]) | (aosIds[order][1:] != aosIds[order][:-1])
+        peaks = self._select(peaks, order[unique])
+
+        # AOS & LOS : ROOT OF THE HERMITE CUBIC, THEN NEWTON ON THE PROPAGATED ELEVATION
+        aosRefined, aosBracket = self._eventBracket(peaks, crossings, offsets, rising=True)
+        losRefined, losBracket = self._eventBracket(peaks, crossings, offsets, rising=False)
+        events = self._concatenate([aosBracket, losBracket])
+        lower, upper = events['LOWER'], events['UPPER']
+        cubic = self._hermite(events['LOWER_VALUE'], events['LOWER_RATE'], events['UPPER_VALUE'], events['UPPER_RATE'], upper - lower)
+        fractions = self._polynomialRoot(cubic, events['LOWER_VALUE'], events['UPPER_VALUE'])
+        roots, _ = self._refineRoots(satellites, events['SATELLITE'], events['STATION'], 0, lower + fractions * (upper - lower), lower.copy(), upper.copy(),
+                                     events['LOWER_VALUE'], events['UPPER_VALUE'], sinMinimum)
+        nbAos = int(aosRefined.sum())
+        aosTimes, losTimes = np.full(peaks['TIME'].size, offsets[0]), np.full(peaks['TIME'].size, offsets[-1])
+        aosTimes[aosRefined], losTimes[losRefined] = roots[:nbAos], roots[nbAos:]
+
+        # PASSES SORTED BY AOS
+        order = np.lexsort((peaks['STATION'], peaks['SATELLITE'], aosTimes))
+        startTime = np.datetime64(start.replace(tzinfo=None), 'us')
+        maxElevations = np.arcsin(np.clip(peaks['VALUE'][order] + sinMinimum, -1, 1))
+        return {'SATELLITE': peaks['SATELLITE'][order], 'STATION': peaks['STATION'][order], 'AOS': self._toDatetimes(startTime, aosTimes[order]),
+                'TCA': self._toDatetimes(startTime, peaks['TIME'][order]), 'LOS': self._toDatetimes(startTime, losTimes[order]),
+                'MAX_ELEVATION': maxElevations if self.radians else np.rad2deg(maxElevations), 'DURATION': (losTimes - aosTimes)[order]}
@@ -0,0 +1,111 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+
+
+def _sharedArrays(memory, nbObjects, maxSamples):
+    positionsSize = nbObjects * maxSamples * 3 * 8
+    positions = np.ndarray((nbObjects, maxSamples, 3), dtype=np.float64, buffer=memory.buf, offset=0)
+    velocities = np.ndarray((nbObjects, maxSamples, 3), dtype=np.float64, buffer=memory.buf, offset=positionsSize)
+    errors = np.ndarray((nbObjects, maxSamples), dtype=np.uint8, buffer=memory.buf, offset=2 * positionsSize)
+    return positions, velocities, errors
+
+
+def _propagationProcess(connection):
+    memory, satelliteArray, start, stop, arrays = None, None, 0, 0, None
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        command, payload = message
+        if command == 'LOAD':
+            memoryName, nbObjects, maxSamples, start, tleLines = payload
+            arrays = None
+            if memory is not None:
+                memory.close()
+            memory = shared_memory.SharedMemory(name=memoryName)
+            arrays = _sharedArrays(memory, nbObjects, maxSamples)
+            satelliteArray = SatrecArray([Satrec.twoline2rv(line1, line2) for line1, line2 in tleLines]) if tleLines else None
+            stop = start + len(tleLines)
+            connection.send(('LOADED', len(tleLines)))
+        elif command == 'PROPAGATE':
+            julianDates, fractions = payload
+            if satelliteArray is not None:
+                errors, positions, velocities = satelliteArray.sgp4(julianDates, fractions)
+                nbSamples = julianDates.shape[0]
+                arrays[0][start:stop, :nbSamples] = positions
+                arrays[1][start:stop, :nbSamples] = velocities
+                arrays[2][start:stop, :nbSamples] = errors
+            connection.send(('DONE', stop - start))
+    arrays = None
+    if memory is not None:
+        memory.close()
+    connection.close()
+
+
+class PropagationPool:
+    def __init__(self, nbProcesses=None, maxSamples=1):
+        self.nbProcesses = nbProcesses or mp.cpu_count()
+        self.maxSamples = maxSamples
+        self.noradIndices, self.catalogKey = [], None
+        self._memory, self._arrays = None, None
+        context = mp.get_context('spawn')
+        self._connections, self._processes = [], []
+        for _ in range(self.nbProcesses):
+            parentConnection, childConnection = context.Pipe()
+            process = context.Process(target=_propagationProcess, args=(childConnection,), daemon=True)
+            process.start()
+            childConnection.close()
+            self._connections.append(parentConnection)
+            self._processes.append(process)
+
+    def setCatalog(self, noradIndices, tleLines, catalogKey=None):
+        self.noradIndices, self.catalogKey = list(noradIndices), catalogKey
+        nbObjects = len(self.noradIndices)
+        self._releaseMemory()
+        self._memory = shared_memory.SharedMemory(create=True, size=max(nbObjects * self.maxSamples * (6 * 8 + 1), 1))
+        self._arrays = _sharedArrays(self._memory, nbObjects, self.maxSamples)
+        # SHARDING THE CATALOG ACROSS PROCESSES
+        bounds = np.linspace(0, nbObjects, self.nbProcesses + 1).astype(int)
+        for connection, start, stop in zip(self._connections, bounds[:-1], bounds[1:]):
+            connection.send(('LOAD', (self._memory.name, nbObjects, self.maxSamples, int(start), list(tleLines[start:stop]))))
+        for connection in self._connections:
+            connection.recv()
+
+    def propagate(self, julianDates, fractions=None):
+        julianDates = np.ascontiguousarray(np.atleast_1d(julianDates), dtype=np.float64)
+        if fractions is None:
+            fractions = np.zeros_like(julianDates)
+        fractions = np.ascontiguousarray(np.broadcast_to(fractions, julianDates.shape), dtype=np.float64)
+        nbSamples = julianDates.shape[0]
+        if nbSamples > self.maxSamples:
+            raise ValueError(f'Cannot propagate {nbSamples} samples with a pool sized for {self.maxSamples}')
+        if self._arrays is None:
+            raise RuntimeError('No catalog loaded in the propagation pool')
+        for connection in self._connections:
+            connection.send(('PROPAGATE', (julianDates, fractions)))
+        for connection in self._connections:
+            connection.recv()
+        positions, velocities, errors = self._arrays
+        return positions[:, :nbSamples].copy(), velocities[:, :nbSamples].copy(), errors[:, :nbSamples].copy()
+
+    def _releaseMemory(self):
+        self._arrays = None
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=2)
+        self._connections, self._processes = [], []
+        self._releaseMemory()
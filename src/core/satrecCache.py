@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+from sgp4.api import Satrec
+
+
+class SatrecCache:
+    def __init__(self, capacity=32768):
+        self.configuredCapacity, self.reserved = capacity, 0  # <<< RESERVED : OBJECTS PROPAGATED EVERY TICK MUST NEVER EVICT EACH OTHER
+        self.capacity = capacity
+        self._entries = OrderedDict()  # <<< KEY : (VALIDATOR, SATREC), LEAST RECENTLY USED FIRST
+        self._lock = threading.Lock()  # <<< WORKER LOOKUPS, GUI RESIZES & STATISTICS
+        self.hits, self.misses, self.evictions, self.invalidations = 0, 0, 0, 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, validator, tleLinesLoader):
+        with self._lock:
+            # THE VALIDATOR (ELEMENT SET EPOCH) CHANGES WHEN THE SOURCE IS REFRESHED
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == validator:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.invalidations += 1
+            self.misses += 1
+            satellite = Satrec.twoline2rv(*tleLinesLoader())
+            self._entries[key] = (validator, satellite)
+            self._entries.move_to_end(key)
+            self._evict()
+            return satellite
+
+    def _evict(self):
+        # CALLED WITH THE LOCK HELD
+        self.capacity = max(self.configuredCapacity, self.reserved)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def reserve(self, count):
+        # A CYCLIC ACCESS PATTERN LARGER THAN THE CAPACITY MISSES ON EVERY LOOKUP
+        with self._lock:
+            self.reserved = count
+            self._evict()
+
+    def setCapacity(self, capacity):
+        with self._lock:
+            self.configuredCapacity = capacity
+            self._evict()
+
+    def statistics(self):
+        with self._lock:
+            return {'SIZE': len(self._entries), 'CAPACITY': self.capacity, 'HITS': self.hits, 'MISSES': self.misses,
+                    'EVICTIONS': self.evictions, 'INVALIDATIONS': self.invalidations}
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class ScreenPicker:
+    def __init__(self, threshold=20.0):
+        self.threshold = float(threshold)  # PIXELS
+        self.key = None
+        self._windowPositions, self._rows = np.zeros((0, 2)), np.zeros(0, dtype=np.int64)
+        self._cellKeys, self._cellStarts, self._cellCounts, self._nbRows = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), 0
+
+    @staticmethod
+    def perspectiveMatrix(fieldOfView, aspect, near, far):
+        # SAME MATRIX AS gluPerspective
+        f = 1.0 / np.tan(np.deg2rad(fieldOfView) / 2)
+        return np.array([[f / aspect, 0, 0, 0], [0, f, 0, 0], [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)], [0, 0, -1, 0]])
+
+    @staticmethod
+    def translationMatrix(x, y, z):
+        matrix = np.eye(4)
+        matrix[:3, 3] = x, y, z
+        return matrix
+
+    @staticmethod
+    def rotationMatrix(angle, x, y, z):
+        # SAME MATRIX AS glRotatef : ANGLE IN DEGREES ABOUT THE (X, Y, Z) AXIS
+        axis = np.array([x, y, z], dtype=float) / np.linalg.norm([x, y, z])
+        cosAngle, sinAngle = np.cos(np.deg2rad(angle)), np.sin(np.deg2rad(angle))
+        cross = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+        matrix = np.eye(4)
+        matrix[:3, :3] = cosAngle * np.eye(3) + (1 - cosAngle) * np.outer(axis, axis) + sinAngle * cross
+        return matrix
+
+    def build(self, positions, modelViewProjection, width, height, key=None):
+        # ONE PROJECTION FOR ALL OBJECTS, WINDOW COORDINATES WITH THE ORIGIN AT THE BOTTOM LEFT
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        clip = positions @ modelViewProjection[:, :3].T + modelViewProjection[:, 3]
+        inFront = clip[:, 3] > 0
+        ndc = clip[:, :3] / np.where(inFront, clip[:, 3], 1.0)[:, None]
+        windowPositions = np.stack(((ndc[:, 0] + 1) / 2 * width, (ndc[:, 1] + 1) / 2 * height), axis=-1)
+        # ONLY OBJECTS BETWEEN THE CLIPPING PLANES AND WITHIN ONE THRESHOLD OF THE WINDOW CAN BE PICKED
+        margin = self.threshold
+        pickable = inFront & (np.abs(ndc[:, 2]) <= 1) & (windowPositions[:, 0] >= -margin) & (windowPositions[:, 0] <= width + margin) \
+            & (windowPositions[:, 1] >= -margin) & (windowPositions[:, 1] <= height + margin)
+        rows = np.flatnonzero(pickable)
+        # UNIFORM GRID OF THRESHOLD SIZED CELLS : A QUERY ONLY VISITS THE 3 X 3 CELLS AROUND THE CURSOR
+        self._nbRows = int(np.ceil(height / self.threshold)) + 4
+        cellKeys = self._cellKey(windowPositions[rows])
+        order = np.argsort(cellKeys, kind='stable')
+        self._rows, self._windowPositions = rows[order], windowPositions[rows[order]]
+        self._cellKeys, self._cellStarts, self._cellCounts = np.unique(cellKeys[order], return_index=True, return_counts=True)
+        self.key = key
+
+    def _cellKey(self, windowPositions):
+        cells = np.floor(np.asarray(windowPositions) / self.threshold).astype(np.int64) + 2
+        return cells[..., 0] * self._nbRows + cells[..., 1]
+
+    def nearest(self, x, y):
+        if not self._cellKeys.size:
+            return None
+        centerKey = self._cellKey([x, y])
+        neighbourKeys = (centerKey + np.arange(-1, 2)[:, None] * self._nbRows + np.arange(-1, 2)).ravel()
+        cells = np.minimum(np.searchsorted(self._cellKeys, neighbourKeys), self._cellKeys.size - 1)
+        cells = cells[self._cellKeys[cells] == neighbourKeys]
+        if not cells.size:
+            return None
+        candidates = np.concatenate([np.arange(start, start + count) for start, count in zip(self._cellStarts[cells], self._cellCounts[cells])])
+        distances = np.hypot(self._windowPositions[candidates, 0] - x, self._windowPositions[candidates, 1] - y)
+        closest = int(np.argmin(distances))
+        if distances[closest] >= self.threshold:
+            return None
+        return int(self._rows[candidates[closest]])
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+
+from src.core.tleParser import TLE_LINE_LENGTH
+
+
+class TleArchive:
+    RECORD_DTYPE = np.dtype([('NORAD_CAT_ID', '<i4'), ('EPOCH', '<f8'), ('TLE_LINE1', f'S{TLE_LINE_LENGTH}'), ('TLE_LINE2', f'S{TLE_LINE_LENGTH}')])
+    # COMPOSITE SEARCH KEY : NORAD ID * KEY_SCALE + DAYS SINCE 1950
+    KEY_ORIGIN, KEY_SCALE = 2433282.5, 1e6
+
+    def __init__(self, path):
+        self.path = path
+        self._load()
+
+    def _load(self):
+        self._records = np.zeros(0, dtype=self.RECORD_DTYPE)
+        if os.path.exists(self.path):
+            nbRecords, remainder = divmod(os.path.getsize(self.path), self.RECORD_DTYPE.itemsize)
+            if remainder:
+                # INTERRUPTED APPEND : DROP THE PARTIAL TRAILING RECORD
+                os.truncate(self.path, nbRecords * self.RECORD_DTYPE.itemsize)
+            if nbRecords:
+                self._records = np.memmap(self.path, dtype=self.RECORD_DTYPE, mode='r', shape=(nbRecords,))
+        noradIndices, epochs = np.asarray(self._records['NORAD_CAT_ID']), np.asarray(self._records['EPOCH'])
+        self._order = np.lexsort((epochs, noradIndices))
+        self._noradIndices, self._epochs = noradIndices[self._order], epochs[self._order]
+        self._keys = self._noradIndices * self.KEY_SCALE + (self._epochs - self.KEY_ORIGIN)
+
+    def __len__(self):
+        return self._order.size
+
+    def append(self, noradIndices, epochs, tleLines):
+        records = np.zeros(len(noradIndices), dtype=self.RECORD_DTYPE)
+        records['NORAD_CAT_ID'], records['EPOCH'] = noradIndices, epochs
+        tleLines = np.asarray(tleLines, dtype=f'S{TLE_LINE_LENGTH}').reshape(-1, 2)
+        records['TLE_LINE1'], records['TLE_LINE2'] = tleLines[:, 0], tleLines[:, 1]
+        # ONLY (NORAD ID, EPOCH) PAIRS NOT ARCHIVED YET, ONCE EACH
+        order = np.lexsort((records['EPOCH'], records['NORAD_CAT_ID']))
+        records = records[order]
+        unique = np.ones(records.size, dtype=bool)
+        unique[1:] = (records['NORAD_CAT_ID'][1:] != records['NORAD_CAT_ID'][:-1]) | (records['EPOCH'][1:] != records['EPOCH'][:-1])
+        records = records[unique & ~self.contains(records['NORAD_CAT_ID'], records['EPOCH'])]
+        if records.size:
+            with open(self.path, 'ab') as f:
+                f.write(records.tobytes())
+            self._load()
+        return records.size
+
+    def contains(self, noradIndices, epochs):
+        if not self._order.size:
+            return np.zeros(len(noradIndices), dtype=bool)
+        positions = self.nearest(noradIndices, epochs)
+        return (positions >= 0) & (self._epochs[np.maximum(positions, 0)] == epochs)
+
+    def nearest(self, noradIndices, julianDates):
+        noradIndices = np.asarray(noradIndices, dtype=np.int64)
+        julianDates = np.broadcast_to(np.asarray(julianDates, dtype=np.float64), noradIndices.shape)
+        if not self._order.size:
+            return np.full(noradIndices.shape, -1)
+        starts = np.searchsorted(self._noradIndices, noradIndices, side='left')
+        stops = np.searchsorted(self._noradIndices, noradIndices, side='right')
+        found = stops > starts
+        # CANDIDATES ON EACH SIDE OF THE REQUESTED DATE, WITHIN THE OBJECT'S OWN RECORDS
+        after = np.searchsorted(self._keys, noradIndices * self.KEY_SCALE + (julianDates - self.KEY_ORIGIN))
+        after = np.clip(after, starts, np.maximum(stops - 1, starts))
+        before = np.maximum(after - 1, starts)
+        after, before = np.minimum(after, self._order.size - 1), np.minimum(before, self._order.size - 1)
+        closest = np.where(np.abs(self._epochs[before] - julianDates) <= np.abs(self._epochs[after] - julianDates), before, after)
+        return np.where(found, closest, -1)
+
+    def epochAt(self, position):
+        return float(self._epochs[position])
+
+    def epochsAt(self, positions):
+        return self._epochs[positions]
+
+    def tleLinesAt(self, position):
+        record = self._records[self._order[position]]
+        return record['TLE_LINE1'].decode('ascii'), record['TLE_LINE2'].decode('ascii')
+
+    def epochs(self, noradIndex):
+        start = np.searchsorted(self._noradIndices, noradIndex, side='left')
+        stop = np.searchsorted(self._noradIndices, noradIndex, side='right')
+        return self._epochs[start:stop].copy()
@@ -1,11 +1,22 @@
 import os
+import json
+import pickle
+import threading
 import time
+import numpy as np
 import pandas as pd
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 
-from PyQt5.QtCore import QObject, pyqtSignal
-from sgp4.api import Satrec, jday
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from sgp4.api import jday
+
+from src.core.compactCatalog import CompactCatalog
+from src.core.satrecCache import SatrecCache
+from src.core.tleArchive import TleArchive
+from src.core.tleParser import parseTleFile
 
 
 class TLEDatabase:
@@ -22,123 +33,397 @@ class TLEDatabase:
     }
     SATCAT_URL = 'https://celestrak.org/pub/satcat.csv'
     SATCAT_FILENAME = 'satcat.csv'
-    SATCAT_ORBITAL_COLUMNS = {'INCLINATION', 'PERIOD', 'APOGEE', 'PERIGEE'}
+    # ONLY THE FIELDS SHOWN FOR THE SELECTED OBJECT, THE ORBITAL ONES COME FROM THE TLE
+    SATCAT_COLUMNS = {'NORAD_CAT_ID': 'int64', 'OBJECT_ID': 'object', 'OBJECT_TYPE': 'category', 'OPS_STATUS_CODE': 'category', 'OWNER': 'category'}
     UPDATE_INTERVAL = timedelta(days=2)
+    CATALOG_CACHE_FILENAME = 'catalog.pkl'
+    CATALOG_CACHE_VERSION = 5
+    DOWNLOAD_STATE_FILENAME = 'downloads.json'
+    ARCHIVE_FILENAME = 'tle_archive.bin'
+    SATREC_CACHE_SIZE = 32768
+    DOWNLOAD_TIMEOUT = 10
+    DOWNLOAD_CHUNK_SIZE = 1 << 16
 
-    def __init__(self, dataDir='data'):
+    def __init__(self, dataDir='data', sources=None, satcatUrl=None, satrecCache=None, updateInterval=None):
         self.dataDir, self.tleDataDir = dataDir, os.path.join(dataDir, 'norad')
-        self.rows = []  # <<< FAST ACCUMULATION LIST
-        self.dataFrame = None
+        self.sources = dict(sources or self.CELESTRAK_SOURCES)
+        self.satcatUrl = satcatUrl or self.SATCAT_URL
+        self.updateInterval = self.UPDATE_INTERVAL if updateInterval is None else updateInterval  # <<< ZERO : ALWAYS REFRESH
+        self.frames = []  # <<< ONE PARSED FRAME PER SOURCE
+        self.sourceFrames = {}  # <<< TAG : (FILE MTIME, PARSED FRAME) OF EVERY WHOLE GROUP, KEPT AFTER finalize FOR THE CATALOG CACHE
+        self.catalog, self.satcat = None, None
         os.makedirs(self.tleDataDir, exist_ok=True)
-        self._satrecCache = {}
+        self.satrecCache = satrecCache if satrecCache is not None else SatrecCache(self.SATREC_CACHE_SIZE)  # <<< MAY BE SHARED ACROSS REFRESHES
+        self._archive = None
+        self._session, self._downloadLock = None, threading.Lock()
+        self._downloadState = self._loadDownloadState()
+
+    def _loadDownloadState(self):
+        path = os.path.join(self.dataDir, self.DOWNLOAD_STATE_FILENAME)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'Ignoring unreadable download state: {e}')
+            return {}
+
+    def _saveDownloadState(self):
+        path = os.path.join(self.dataDir, self.DOWNLOAD_STATE_FILENAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self._downloadState, f, indent=4)
+        os.replace(path + '.tmp', path)
 
     def _fileNeedsUpdate(self, path):
         if not os.path.exists(path):
             return True
-        lastMod = datetime.fromtimestamp(os.path.getmtime(path))
-        return datetime.utcnow() - lastMod > self.UPDATE_INTERVAL
+        # LAST SUCCESSFUL CHECK, SO THAT A 304 DOES NOT TOUCH THE FILE NOR INVALIDATE THE CATALOG CACHE
+        lastCheck = self._downloadState.get(os.path.relpath(path, self.dataDir), {}).get('CHECKED', os.path.getmtime(path))
+        return time.time() - lastCheck > self.updateInterval.total_seconds()
+
+    def _getSession(self):
+        if self._session is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(self.sources) + 1)
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+        return self._session
+
+    def _fetch(self, label, url, path):
+        if not self._fileNeedsUpdate(path):
+            return path
+        key = os.path.relpath(path, self.dataDir)
+        with self._downloadLock:
+            state = dict(self._downloadState.get(key, {}))
+        headers = {}
+        if os.path.exists(path):
+            if 'ETAG' in state:
+                headers['If-None-Match'] = state['ETAG']
+            if 'LAST_MODIFIED' in state:
+                headers['If-Modified-Since'] = state['LAST_MODIFIED']
+        print(f'Downloading {label}...')
+        with self._getSession().get(url, headers=headers, timeout=self.DOWNLOAD_TIMEOUT, stream=True) as res:
+            if res.status_code != 304:
+                res.raise_for_status()
+                temporaryPath = f'{path}.{threading.get_ident()}.part'
+                try:
+                    with open(temporaryPath, 'wb') as f:
+                        for chunk in res.iter_content(self.DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                    os.replace(temporaryPath, path)
+                finally:
+                    if os.path.exists(temporaryPath):
+                        os.remove(temporaryPath)
+                state = {'ETAG': res.headers.get('ETag'), 'LAST_MODIFIED': res.headers.get('Last-Modified')}
+                state = {name: value for name, value in state.items() if value}
+        state['CHECKED'] = time.time()
+        with self._downloadLock:
+            self._downloadState[key] = state
+            self._saveDownloadState()
+        return path
 
     def _download(self, tag, url):
-        localPath = os.path.join(self.tleDataDir, f'{tag}.txt')
-        if self._fileNeedsUpdate(localPath):
-            print(f'Downloading {tag}...')
-            res = requests.get(url, timeout=10)
-            res.raise_for_status()
-            with open(localPath, 'w', encoding='utf-8') as f:
-                f.write(res.text)
-        return localPath
-
-    def _loadSatCat(self):
+        return self._fetch(tag, url, os.path.join(self.tleDataDir, f'{tag}.txt'))
+
+    def loadSatCat(self):
+        # LOCAL FILE ONLY, KEPT AS A SEPARATE NORAD INDEXED TABLE RESTRICTED TO THE TRACKED OBJECTS
         path = os.path.join(self.dataDir, self.SATCAT_FILENAME)
-        if self._fileNeedsUpdate(path):
-            print('Downloading SATCAT...')
-            import requests
-            r = requests.get(self.SATCAT_URL, timeout=10)
-            r.raise_for_status()
-            with open(path, 'wb') as f:
-                f.write(r.content)
-        self.satcat = pd.read_csv(path)
-
-    @staticmethod
-    def _parseTLE(name, line1, line2, tag=None, source=None):
-        noradIndex = int(line1[2:7])
-
-        # EPOCH CONVERSION
-        epochString = line1[18:32]
-        year = 2000 + int(epochString[:2]) if int(epochString[:2]) < 57 else 1900 + int(epochString[:2])
-        epochBase = datetime(year, 1, 1) + timedelta(days=float(epochString[2:]) - 1)
-        jdEpoch = jday(year, epochBase.month, epochBase.day, epochBase.hour, epochBase.minute, epochBase.second + epochBase.microsecond / 1e6)
-
-        # ORBITAL ELEMENTS
-        bStar = float(f'{line1[53]}0.{line1[54:59]}e{line1[59:61]}')
-        inclination, eccentricity = float(line2[8:16]), float(f'0.{line2[26:33]}')
-        raan, argPerigee = float(line2[17:25]), float(line2[34:42])
-        meanAnomaly, meanMotion = float(line2[43:51]), float(line2[52:63])
-        revNumber = int(line2[63:68])
-
-        return {
-            'OBJECT_NAME': name, 'NORAD_CAT_ID': noradIndex, 'EPOCH': jdEpoch,
-            'MEAN_MOTION': meanMotion, 'ECCENTRICITY': eccentricity, 'INCLINATION': inclination,
-            'RA_OF_ASC_NODE': raan, 'ARG_OF_PERICENTER': argPerigee, 'MEAN_ANOMALY': meanAnomaly,
-            'BSTAR': bStar, 'REV_AT_EPOCH': revNumber, 'TLE_LINE1': line1, 'TLE_LINE2': line2,
-            'tags': [tag] if tag else [], 'source': source
-        }
-
-    def loadSource(self, tag):
-        if tag not in self.CELESTRAK_SOURCES:
+        if os.path.exists(path):
+            header = pd.read_csv(path, nrows=0).columns
+            columns = {name: dtype for name, dtype in self.SATCAT_COLUMNS.items() if name in header}
+            satcat = pd.read_csv(path, usecols=list(columns), dtype=columns).set_index('NORAD_CAT_ID')
+        else:
+            satcat = pd.DataFrame(columns=list(self.SATCAT_COLUMNS)).set_index('NORAD_CAT_ID')
+        satcat = satcat[~satcat.index.duplicated(keep='last')]
+        self.satcat = satcat[satcat.index.isin(self.catalog.noradIndices)]
+
+    def downloadSources(self, progressCallback=None):
+        downloads = {tag: (url, os.path.join(self.tleDataDir, f'{tag}.txt')) for tag, url in self.sources.items()}
+        downloads['SATCAT'] = (self.satcatUrl, os.path.join(self.dataDir, self.SATCAT_FILENAME))
+        failures = {}
+        with ThreadPoolExecutor(max_workers=len(downloads)) as executor:
+            futures = {executor.submit(self._fetch, label, url, path): (label, path) for label, (url, path) in downloads.items()}
+            for completed, future in enumerate(as_completed(futures), 1):
+                label, path = futures[future]
+                try:
+                    future.result()
+                except requests.RequestException as e:
+                    if not os.path.exists(path):
+                        failures[label] = e
+                    else:
+                        print(f'Could not refresh {label}, keeping the local copy: {e}')
+                if progressCallback is not None:
+                    progressCallback(completed, len(futures), label)
+        if failures:
+            label, error = next(iter(failures.items()))
+            raise RuntimeError(f'Could not download {label}: {error}') from error
+
+    def _sourcesSignature(self):
+        paths = [os.path.join(self.tleDataDir, f'{tag}.txt') for tag in self.sources] + [os.path.join(self.dataDir, self.SATCAT_FILENAME)]
+        return {os.path.relpath(path, self.dataDir): os.path.getmtime(path) for path in paths if os.path.exists(path)}
+
+    def loadCatalogCache(self):
+        path = os.path.join(self.dataDir, self.CATALOG_CACHE_FILENAME)
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception as e:
+            print(f'Ignoring unreadable catalog cache: {e}')
+            return False
+        if cache.get('VERSION') != self.CATALOG_CACHE_VERSION or cache.get('SOURCES') != self._sourcesSignature():
+            return False
+        self.catalog, self.satcat = cache['CATALOG'], cache['SATCAT']
+        return True
+
+    def loadCachedSources(self):
+        # EACH GROUP'S OWN FRAME AS PARSED WHEN THE CATALOG CACHE WAS SAVED : TAG -> (FILE MTIME, FRAME), EVEN IF THE CACHE IS NOW STALE
+        path = os.path.join(self.dataDir, self.CATALOG_CACHE_FILENAME)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception as e:
+            print(f'Ignoring unreadable catalog cache: {e}')
+            return {}
+        if cache.get('VERSION') != self.CATALOG_CACHE_VERSION:
+            return {}
+        # TAG BITS FOLLOW THE CURRENT SOURCES ORDER
+        return {tag: (modificationTime, frame.assign(TAGS=np.uint32(1 << list(self.sources).index(tag))))
+                for tag, (modificationTime, frame) in cache['SOURCE_FRAMES'].items() if tag in self.sources}
+
+    def saveCatalogCache(self):
+        path = os.path.join(self.dataDir, self.CATALOG_CACHE_FILENAME)
+        cache = {'VERSION': self.CATALOG_CACHE_VERSION, 'SOURCES': self._sourcesSignature(), 'CATALOG': self.catalog, 'SATCAT': self.satcat,
+                 'SOURCE_FRAMES': self.sourceFrames}
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        # GROUP FRAMES ARE ONLY KEPT FOR THE CACHE, NOT BY THE PUBLISHED DATABASE
+        self.sourceFrames = {}
+
+    def loadSource(self, tag, noradIndices=None):
+        if tag not in self.sources:
             raise ValueError(f'Unknown CelesTrak tag: {tag}')
-        path = self._download(tag, self.CELESTRAK_SOURCES[tag])
-        with open(path, 'r', encoding='utf-8') as f:
-            lines = [l.strip() for l in f if l.strip()]
-        for i in range(0, len(lines), 3):
-            try:
-                row = self._parseTLE(lines[i], lines[i+1], lines[i+2], tag, self.CELESTRAK_SOURCES[tag])
-            except Exception as e:
-                print(f"Skipping {lines[i] if i<len(lines) else 'unknown'}: {e}")
-                continue
-            self.rows.append(row)
+        self._appendSource(tag, self._download(tag, self.sources[tag]), noradIndices)
+
+    def loadLocalSources(self, noradIndices=None):
+        # NO NETWORK : ONLY THE GROUPS ALREADY ON DISK, OPTIONALLY RESTRICTED TO SOME OBJECTS
+        for tag in self.sources:
+            path = os.path.join(self.tleDataDir, f'{tag}.txt')
+            if os.path.exists(path):
+                self._appendSource(tag, path, noradIndices)
+
+    def _appendSource(self, tag, path, noradIndices=None):
+        modificationTime = os.path.getmtime(path)
+        columns, malformed = parseTleFile(path)
+        nbMalformed = sum(malformed.values())
+        if nbMalformed:
+            print(f"Skipping {nbMalformed} malformed records in {tag}: " + ', '.join(f'{count} {reason.lower()}' for reason, count in malformed.items() if count))
+        if not columns:
+            return
+        frame = pd.DataFrame(columns)
+        if noradIndices is not None:
+            frame = frame[frame['NORAD_CAT_ID'].isin(list(noradIndices))].reset_index(drop=True)
+        frame['TAGS'] = np.uint32(1 << list(self.sources).index(tag))
+        self.frames.append(frame)
+        if noradIndices is None:
+            self.sourceFrames[tag] = (modificationTime, frame)
+
+    def appendParsedSource(self, tag, modificationTime, frame):
+        self.frames.append(frame)
+        self.sourceFrames[tag] = (modificationTime, frame)
+
+    @property
+    def archive(self):
+        if self._archive is None:
+            self._archive = TleArchive(os.path.join(self.dataDir, self.ARCHIVE_FILENAME))
+        return self._archive
 
     def finalize(self):
-        df = pd.DataFrame(self.rows)
-        df = df.sort_values('EPOCH')
+        df = pd.concat(self.frames, ignore_index=True)
+        # EVERY ELEMENT SET SEEN GOES TO THE ARCHIVE BEFORE KEEPING ONLY THE LATEST ONES
+        self.archive.append(df['NORAD_CAT_ID'].to_numpy(), df['EPOCH'].to_numpy(), df[['TLE_LINE1', 'TLE_LINE2']].to_numpy(dtype=str))
+        # EVERY GROUP AN OBJECT BELONGS TO, THEN ONLY ITS LATEST ELEMENTS
+        noradIndices, inverse = np.unique(df['NORAD_CAT_ID'].to_numpy(), return_inverse=True)
+        tags = np.zeros(noradIndices.size, dtype=np.uint32)
+        np.bitwise_or.at(tags, inverse, df['TAGS'].to_numpy(dtype=np.uint32))
+        df = df.sort_values('EPOCH', kind='stable')
         df = df.drop_duplicates(subset='NORAD_CAT_ID', keep='last')
-        self._loadSatCat()
-        satcat = self.satcat.drop(columns=self.SATCAT_ORBITAL_COLUMNS & set(self.satcat.columns), errors='ignore')
-        df = df.merge(satcat, how='left', on='NORAD_CAT_ID')
-        if 'OBJECT_NAME_x' in df.columns:
-            df['OBJECT_NAME'] = df['OBJECT_NAME_x']
-        df = df.drop(columns=[c for c in ['OBJECT_NAME_x', 'OBJECT_NAME_y'] if c in df.columns])
-        df = df.sort_values('OBJECT_NAME').reset_index(drop=True)
-        self.dataFrame = df
-
-    def getSatrec(self, noradIndex):
-        if noradIndex not in self._satrecCache:
-            row = self.dataFrame[self.dataFrame['NORAD_CAT_ID'] == noradIndex].iloc[0]
-            self._satrecCache[noradIndex] = Satrec.twoline2rv(row['TLE_LINE1'], row['TLE_LINE2'])
-        return self._satrecCache[noradIndex]
+        df['TAGS'] = tags[np.searchsorted(noradIndices, df['NORAD_CAT_ID'].to_numpy())]
+        self.catalog = CompactCatalog.fromDataFrame(df, list(self.sources))
+        self.frames = []
+
+    @property
+    def dataFrame(self):
+        # CONVENIENCE VIEW, REBUILT ON EACH ACCESS
+        return None if self.catalog is None else self.catalog.toDataFrame()
+
+    def memoryReport(self):
+        report = {f'CATALOG_{name}': size for name, size in self.catalog.memoryReport().items() if name != 'TOTAL'}
+        if self.satcat is not None:
+            report['SATCAT'] = int(self.satcat.memory_usage(deep=True).sum())
+        report['TOTAL'] = sum(report.values())
+        return report
+
+    def hasObject(self, noradIndex):
+        return self.catalog.hasObject(int(noradIndex))
+
+    def hasObjects(self, noradIndices):
+        return self.catalog.indicesOf(np.asarray(noradIndices, dtype=np.int64)) >= 0
+
+    def getObjectRow(self, noradIndex):
+        if not self.hasObject(noradIndex):
+            return None
+        # SATCAT FIELDS JOINED ON DEMAND FOR THIS SINGLE OBJECT
+        if self.satcat is None:
+            self.loadSatCat()
+        row = pd.Series(self.catalog.getRow(int(noradIndex)))
+        if int(noradIndex) in self.satcat.index:
+            row = pd.concat([row, self.satcat.loc[int(noradIndex)]])
+        return row
+
+    def getSatrec(self, noradIndex, simulationTime: datetime = None):
+        return self.getSatrecs([noradIndex], simulationTime)[0]
+
+    def getSatrecs(self, noradIndices, simulationTime: datetime = None):
+        # LATEST ELEMENTS, OR THE ARCHIVED ONES WITH THE EPOCH CLOSEST TO THE SIMULATION TIME
+        archivePositions = self._archivePositions(noradIndices, simulationTime)
+        catalogEpochs = self.catalog.elements[self.catalog.indicesOf(np.asarray(noradIndices, dtype=np.int64)), 0]
+        satellites = []
+        for noradIndex, archivePosition, catalogEpoch in zip(noradIndices, archivePositions.tolist(), catalogEpochs.tolist()):
+            if archivePosition < 0:
+                satellite = self.satrecCache.get(noradIndex, catalogEpoch, lambda: self.catalog.getTleLines(int(noradIndex)))
+            else:
+                epoch = self.archive.epochAt(archivePosition)
+                satellite = self.satrecCache.get((noradIndex, epoch), epoch, lambda: self.archive.tleLinesAt(archivePosition))
+            satellites.append(satellite)
+        return satellites
+
+    def getEpochs(self, noradIndices, simulationTime: datetime = None):
+        # EPOCHS OF THE ELEMENT SETS getSatrecs SELECTS, WITHOUT BUILDING ANY SATREC
+        archivePositions = self._archivePositions(noradIndices, simulationTime)
+        epochs = self.catalog.elements[self.catalog.indicesOf(np.asarray(noradIndices, dtype=np.int64)), 0]
+        archived = archivePositions >= 0
+        epochs[archived] = self.archive.epochsAt(archivePositions[archived])
+        return epochs
+
+    def _archivePositions(self, noradIndices, simulationTime):
+        if simulationTime is None or not len(self.archive):
+            return np.full(len(noradIndices), -1)
+        julianDate, fraction = jday(simulationTime.year, simulationTime.month, simulationTime.day, simulationTime.hour, simulationTime.minute, simulationTime.second + simulationTime.microsecond / 1e6)
+        return self.archive.nearest(noradIndices, julianDate + fraction)
 
     def getObjectName(self, noradIndex):
-        row = self.dataFrame[self.dataFrame['NORAD_CAT_ID'] == noradIndex].iloc[0]
-        return row['OBJECT_NAME']
+        return self.catalog.getObjectName(int(noradIndex))
+
+    def getObjectNames(self, noradIndices):
+        return self.catalog.namesAt(self.catalog.indicesOf(noradIndices))
+
+    def getTleLines(self, noradIndex, simulationTime: datetime = None):
+        position = self._archivePositions([noradIndex], simulationTime)[0]
+        if position >= 0:
+            return self.archive.tleLinesAt(position)
+        return self.catalog.getTleLines(int(noradIndex))
 
 
 class TLELoaderWorker(QObject):
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
+    databaseUpdated = pyqtSignal(object)
     finished = pyqtSignal(object)
 
-    def __init__(self, tleDir):
+    def __init__(self, tleDir, sources=None, satcatUrl=None, previewObjects=None, updateInterval=None):
         super().__init__()
         self.tleDir = tleDir
+        self.sources, self.satcatUrl = sources, satcatUrl
+        self.previewObjects, self.updateInterval = previewObjects, updateInterval
+
+    def _onDownloadProgress(self, completed, total, label):
+        self.status.emit(f'Checked {label} ({completed}/{total})…')
+        self.progress.emit(int(10 * completed / total))
+
+    def _publishPreview(self):
+        # STAGE 1 : A USABLE DATABASE FROM WHAT IS ALREADY ON DISK, BEFORE ANY NETWORK ACCESS
+        preview = TLEDatabase(self.tleDir, self.sources, self.satcatUrl, updateInterval=self.updateInterval)
+        if preview.loadCatalogCache():
+            self.databaseUpdated.emit(preview)
+            return
+        if not self.previewObjects:
+            return
+        self.status.emit('Loading active objects…')
+        preview.loadLocalSources(self.previewObjects)
+        if sum(len(frame) for frame in preview.frames):
+            preview.finalize()
+            self.databaseUpdated.emit(preview)
 
     def run(self):
-        db = TLEDatabase(self.tleDir)
-        total = len(TLEDatabase.CELESTRAK_SOURCES)
-        step = 100 / total
-        current = 0
-        for tag in TLEDatabase.CELESTRAK_SOURCES:
+        if self.previewObjects is not None:
+            self._publishPreview()
+        db = TLEDatabase(self.tleDir, self.sources, self.satcatUrl, updateInterval=self.updateInterval)
+        self.status.emit('Checking for TLE updates…')
+        db.downloadSources(self._onDownloadProgress)
+        self.progress.emit(10)
+        self.status.emit('Loading catalog cache…')
+        if db.loadCatalogCache():
+            self.progress.emit(100)
+            self.finished.emit(db)
+            return
+        total = len(db.sources)
+        step = 80 / total
+        current = 10
+        for tag in db.sources:
+            self.status.emit(f'Parsing {tag}…')
             db.loadSource(tag)
             current += step
             self.progress.emit(int(current))
+        self.status.emit('Indexing SATCAT…')
+        db.finalize()
+        db.loadSatCat()
+        db.saveCatalogCache()
+        self.progress.emit(100)
+        self.finished.emit(db)
+
+
+class TLERefreshWorker(QObject):
+    status = pyqtSignal(str)
+    databaseUpdated = pyqtSignal(object)
+
+    def __init__(self, tleDir, sources=None, satcatUrl=None, updateInterval=None):
+        super().__init__()
+        self.tleDir = tleDir
+        self.sources, self.satcatUrl, self.updateInterval = sources, satcatUrl, updateInterval
+        self._parsedSources = {}  # <<< TAG : (FILE MTIME, PARSED FRAME), REUSED WHILE THE GROUP FILE IS UNCHANGED
+
+    @pyqtSlot()
+    def refresh(self):
+        db = TLEDatabase(self.tleDir, self.sources, self.satcatUrl, updateInterval=self.updateInterval)
+        try:
+            db.downloadSources()
+        except Exception as e:
+            self.status.emit(f'TLE refresh failed: {e}')
+            return
+        # A VALID CATALOG CACHE MEANS THE RUNNING CATALOG ALREADY MATCHES THE FILES ON DISK
+        if db.loadCatalogCache():
+            return
+        self.status.emit('Refreshing TLE catalog…')
+        if not self._parsedSources:
+            # FIRST REFRESH : GROUPS UNCHANGED SINCE THE SAVED CATALOG CACHE REUSE THEIR CACHED FRAMES, NOT RE-PARSED
+            self._parsedSources = db.loadCachedSources()
+        for tag in db.sources:
+            path = os.path.join(db.tleDataDir, f'{tag}.txt')
+            modificationTime = os.path.getmtime(path) if os.path.exists(path) else None
+            parsed = self._parsedSources.get(tag)
+            if parsed is not None and parsed[0] == modificationTime:
+                db.appendParsedSource(tag, *parsed)
+                continue
+            db.loadSource(tag)
+        self._parsedSources = dict(db.sourceFrames)
         db.finalize()
-        self.finished.emit(db)
\ No newline at end of file
+        db.loadSatCat()
+        db.saveCatalogCache()
+        self.status.emit(f'TLE catalog refreshed ({len(db.catalog)} objects)')
+        self.databaseUpdated.emit(db)
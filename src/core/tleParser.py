@@ -0,0 +1,123 @@
+import numpy as np
+
+
+TLE_LINE_LENGTH = 69
+# FIELD : (LINE, START COLUMN, STOP COLUMN, DECIMAL POINT COLUMN OR NEGATIVE IMPLIED DECIMALS)
+TLE_FIELDS = {
+    'NORAD_CAT_ID': (1, 2, 7, None), 'NORAD_CAT_ID_2': (2, 2, 7, None),
+    'EPOCH_YEAR': (1, 18, 20, None), 'EPOCH_DAY': (1, 20, 32, 23),
+    'BSTAR_MANTISSA': (1, 54, 59, -5), 'BSTAR_EXPONENT': (1, 59, 61, None),
+    'INCLINATION': (2, 8, 16, 11), 'RA_OF_ASC_NODE': (2, 17, 25, 20), 'ECCENTRICITY': (2, 26, 33, -7),
+    'ARG_OF_PERICENTER': (2, 34, 42, 37), 'MEAN_ANOMALY': (2, 43, 51, 46), 'MEAN_MOTION': (2, 52, 63, 54),
+    'REV_AT_EPOCH': (2, 63, 68, None),
+}
+
+
+def julianDateOfYearStart(years):
+    years = np.asarray(years, dtype=np.float64)
+    return 367.0 * years - np.floor(7 * years * 0.25) + 31 + 1721013.5
+
+
+def _splitLines(buffer):
+    newlines = np.flatnonzero(buffer == ord('\n'))
+    starts = np.concatenate(([0], newlines + 1))
+    stops = np.concatenate((newlines, [buffer.size]))
+    # TRAILING WHITESPACE & CARRIAGE RETURNS
+    while True:
+        trailing = stops > starts
+        trailing[trailing] = np.isin(buffer[stops[trailing] - 1], (ord('\r'), ord(' '), ord('\t')))
+        if not trailing.any():
+            break
+        stops[trailing] -= 1
+    nonEmpty = stops > starts
+    return starts[nonEmpty], stops[nonEmpty]
+
+
+def _fieldValues(digits, isDigit, characters, field):
+    _, start, stop, decimals = field
+    columns = np.arange(start, stop)
+    if decimals is None or decimals < 0:
+        pointColumn, pointValid = -1, True
+        powers = 10.0 ** (stop - columns - 1 + (decimals or 0))
+    else:
+        pointColumn, pointValid = decimals, characters[:, decimals] == ord('.')
+        powers = np.where(columns < decimals, 10.0 ** (decimals - columns - 1), 10.0 ** (decimals - columns))
+    characters, isDigit = characters[:, start:stop], isDigit[:, start:stop]
+    isMinus = characters == ord('-')
+    allowed = isDigit | isMinus | (characters == ord(' ')) | (characters == ord('+')) | ((characters == ord('.')) & (columns == pointColumn))
+    valid = pointValid & allowed.all(axis=1) & isDigit.any(axis=1)
+    values = digits[:, start:stop] @ powers
+    return np.where(isMinus.any(axis=1), -values, values), valid
+
+
+def parseTleText(raw: bytes):
+    buffer = np.frombuffer(raw, dtype=np.uint8)
+    starts, stops = _splitLines(buffer)
+    lengths = stops - starts
+    if lengths.size == 0:
+        return {}, {}
+    firstCharacters, secondCharacters = buffer[starts], buffer[np.minimum(starts + 1, buffer.size - 1)]
+    isTleLine = (lengths == TLE_LINE_LENGTH) & (secondCharacters == ord(' '))
+    isLine1, isLine2 = isTleLine & (firstCharacters == ord('1')), isTleLine & (firstCharacters == ord('2'))
+
+    # RECORD DETECTION : LINE 1 FOLLOWED BY LINE 2, OPTIONALLY PRECEDED BY A NAME LINE
+    line1Indices = np.flatnonzero(isLine1[:-1] & isLine2[1:])
+    previousIndices = np.maximum(line1Indices - 1, 0)
+    hasName = (line1Indices > 0) & ~isLine1[previousIndices] & ~isLine2[previousIndices]
+    usedLines = np.zeros(lengths.size, dtype=bool)
+    usedLines[line1Indices], usedLines[line1Indices + 1], usedLines[previousIndices[hasName]] = True, True, True
+    malformed = {'STRUCTURE': int((~usedLines).sum())}
+    if line1Indices.size == 0:
+        return {}, malformed
+    offsets = np.arange(TLE_LINE_LENGTH)
+    matrices = {1: buffer[starts[line1Indices][:, None] + offsets], 2: buffer[starts[line1Indices + 1][:, None] + offsets]}
+
+    # CHECKSUMS : DIGITS COUNT THEIR VALUE, MINUS SIGNS COUNT ONE
+    decoded = {}
+    valid = np.ones(line1Indices.size, dtype=bool)
+    for line, characters in matrices.items():
+        digits = characters.astype(np.int16) - ord('0')
+        isDigit = (digits >= 0) & (digits <= 9)
+        digits = np.where(isDigit, digits, 0)
+        decoded[line] = (digits.astype(np.float64), isDigit, characters)
+        total = digits[:, :-1].sum(axis=1) + (characters[:, :-1] == ord('-')).sum(axis=1)
+        valid &= isDigit[:, -1] & (total % 10 == digits[:, -1])
+    malformed['CHECKSUM'] = int((~valid).sum())
+
+    # FIXED COLUMN FIELDS
+    parsed = np.ones(line1Indices.size, dtype=bool)
+    fields = {}
+    for name, field in TLE_FIELDS.items():
+        fields[name], fieldValid = _fieldValues(*decoded[field[0]], field)
+        parsed &= fieldValid
+    parsed &= fields['NORAD_CAT_ID'] == fields['NORAD_CAT_ID_2']
+    malformed['FIELDS'] = int((valid & ~parsed).sum())
+    valid &= parsed
+
+    # EPOCH AS JULIAN DATE & B* FROM ITS IMPLIED DECIMAL NOTATION
+    epochYears = fields['EPOCH_YEAR']
+    epochYears = np.where(epochYears < 57, 2000 + epochYears, 1900 + epochYears)
+    epochs = julianDateOfYearStart(epochYears) + fields['EPOCH_DAY'] - 1
+    bStarSigns = np.where(matrices[1][:, 53] == ord('-'), -1.0, 1.0)
+    bStars = bStarSigns * fields['BSTAR_MANTISSA'] * 10.0 ** fields['BSTAR_EXPONENT']
+
+    nameIndices = np.where(hasName, line1Indices - 1, -1)[valid]
+    nameBounds = zip(starts[nameIndices].tolist(), stops[nameIndices].tolist(), nameIndices.tolist())
+    names = [raw[start:stop].decode('utf-8', errors='replace').strip() if index >= 0 else '' for start, stop, index in nameBounds]
+    line1Text = matrices[1][valid].tobytes().decode('latin-1')
+    line2Text = matrices[2][valid].tobytes().decode('latin-1')
+    bounds = range(0, len(line1Text), TLE_LINE_LENGTH)
+    columns = {
+        'OBJECT_NAME': names, 'NORAD_CAT_ID': fields['NORAD_CAT_ID'][valid].astype(np.int64), 'EPOCH': epochs[valid],
+        'MEAN_MOTION': fields['MEAN_MOTION'][valid], 'ECCENTRICITY': fields['ECCENTRICITY'][valid], 'INCLINATION': fields['INCLINATION'][valid],
+        'RA_OF_ASC_NODE': fields['RA_OF_ASC_NODE'][valid], 'ARG_OF_PERICENTER': fields['ARG_OF_PERICENTER'][valid],
+        'MEAN_ANOMALY': fields['MEAN_ANOMALY'][valid], 'BSTAR': bStars[valid], 'REV_AT_EPOCH': fields['REV_AT_EPOCH'][valid].astype(np.int64),
+        'TLE_LINE1': [line1Text[i:i + TLE_LINE_LENGTH] for i in bounds],
+        'TLE_LINE2': [line2Text[i:i + TLE_LINE_LENGTH] for i in bounds],
+    }
+    return columns, malformed
+
+
+def parseTleFile(path):
+    with open(path, 'rb') as f:
+        return parseTleText(f.read())
@@ -4,33 +4,48 @@ from OpenGL.GL.shaders import compileProgram, compileShader
 
 from PIL import Image
 import numpy as np
-from PyQt5.QtCore import Qt, pyqtSignal, QSignalBlocker
+from PyQt5.QtCore import Qt, pyqtSignal, QSignalBlocker, QTimer
 from PyQt5.QtGui import QMouseEvent, QWheelEvent
 from PyQt5.QtWidgets import QOpenGLWidget, QColorDialog, QGroupBox, QGridLayout, QPushButton, QSpinBox, QComboBox, \
     QVBoxLayout, QWidget, QDockWidget, QSizePolicy
 from OpenGL.GL import *
 
+from src.core.screenPicker import ScreenPicker
 
 
 class View3dWidget(QOpenGLWidget):
     objectSelected = pyqtSignal(list)
     EARTH_RADIUS = 6371
     EARTH_MOON_DISTANCE = 384400
+    EARTH_ROTATION_RATE = 7.2921150e-5  # RAD/S
+    FRAME_INTERVAL = 16  # MS
 
     def __init__(self, parent=None):
         super().__init__(parent)
         glutInit()
         self.setMouseTracking(True)
         self.minZoom, self.maxZoom = 1.15, self.EARTH_MOON_DISTANCE / self.EARTH_RADIUS * 1.15
-        self.objectSpotData, self.objectOrbitData, self.objectNameData = {}, {}, {}
+        self.objectSpotData, self.objectOrbitData, self.objectNameData, self.objectSegmentData = {}, {}, {}, {}
         self.selectedObject, self.hoveredObject, self.visibleNorads, self.displayConfiguration = None, None, [], {}
         self.lastPosX, self.lastPosY = 0, 0
         self.zoom, self.rotX, self.rotY = 5, 45, 225
-        self.earthShader = None
+        self.earthShader, self.spotShader, self.spotSizeLocation = None, None, -1
         self.earthTextureIndex, self.lightsTextureIndex, self.skyboxTexture = 0, 0, 0
         self.gmstAngle = 0
+        # MOTION BETWEEN WORKER UPDATES : HERMITE SEGMENTS EVALUATED AT THE CLOCK'S ESTIMATED TIME
+        self.clock, self.segmentStart, self.segmentDuration, self.segmentGmst = None, None, 1.0, 0.0
+        self.spotSegments, self.spotPositions = np.zeros((0, 4, 3)), np.zeros((0, 3))
+        self.spotVersion, self.picker = 0, ScreenPicker(threshold=20.0)
+        self.frameTimer = QTimer(self)
+        self.frameTimer.timeout.connect(self._onFrameTimer)
         self.sunDirection = np.array([1, 0, 0], dtype=float)
-        self.sphere = None
+        # STATIC GEOMETRY BUFFERS, BUILT ONCE IN initializeGL
+        self.staticBuffers, self.gridRanges, self.earthIndexCount = {}, [], 0
+        # OBJECT VERTEX BUFFERS : NAME -> [BUFFER, CAPACITY IN BYTES], ARRAYS WAITING FOR UPLOAD
+        self.vertexBuffers, self.pendingUploads = {}, {}
+        self.spotNorads, self.spotRows, self.orbitNorads = [], {}, []
+        self.spotCount, self.orbitBatches = 0, []
+        self.orbitFirsts, self.orbitCounts = np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
 
     def initializeGL(self):
         glClearColor(0, 0, 0, 1.0)
@@ -45,8 +60,7 @@ class View3dWidget(QOpenGLWidget):
         glEnable(GL_DEPTH_TEST)
         glDepthFunc(GL_LEQUAL)
         glHint(GL_PERSPECTIVE_CORRECTION_HINT, GL_NICEST)
-        self.sphere = gluNewQuadric()
-        gluQuadricNormals(self.sphere, GLU_SMOOTH)
+        self._buildStaticGeometry()
         try:
             img = Image.open("src/assets/earth/earth.jpg")
             img = img.transpose(Image.FLIP_TOP_BOTTOM)
@@ -88,6 +102,18 @@ class View3dWidget(QOpenGLWidget):
             self.earthShader = compileProgram(compileShader(vertSource, GL_VERTEX_SHADER), compileShader(fragSource, GL_FRAGMENT_SHADER))
         except Exception as e:
             raise RuntimeError(f"Earth shader failed to compile/link:\n{e}")
+        # LOADING OBJECT SPOTS SHADER : ROUND POINT SPRITES, SIZE & COLOR PER VERTEX
+        try:
+            with open("src/assets/earth/spots.vert") as f:
+                vertSource = f.read()
+            with open("src/assets/earth/spots.frag") as f:
+                fragSource = f.read()
+            self.spotShader = compileProgram(compileShader(vertSource, GL_VERTEX_SHADER), compileShader(fragSource, GL_FRAGMENT_SHADER))
+            self.spotSizeLocation = glGetAttribLocation(self.spotShader, "spotSize")
+        except Exception as e:
+            raise RuntimeError(f"Spots shader failed to compile/link:\n{e}")
+        glEnable(GL_VERTEX_PROGRAM_POINT_SIZE)
+        glEnable(GL_POINT_SPRITE)
         # LOADING SKYBOX TEXTURES
         self.skyboxTexture = self._loadCubeMap([
             "src/assets/skybox/posx.png",
@@ -138,9 +164,7 @@ class View3dWidget(QOpenGLWidget):
             glDisable(GL_TEXTURE_2D)
             glColor4f(1, 1, 1, 1)
             # DRAWING OBJECTS AND AXES
-            for noradIndex in self.visibleNorads:
-                if self.displayConfiguration['OBJECTS'].get(str(noradIndex), False):
-                    self._drawObject(noradIndex)
+            self._drawObjects()
             if self.displayConfiguration.get('SHOW_ECI_AXES', False):
                 redColor, greenColor, blueColor = (1, 0, 0), (0, 1, 0), (0, 0, 1)
                 self._drawAxes(redColor, greenColor, blueColor)
@@ -171,8 +195,7 @@ class View3dWidget(QOpenGLWidget):
                 glUniform3f(glGetUniformLocation(self.earthShader, "sunDirection"), sunEcef[1], -sunEcef[0], sunEcef[2])
                 glUniform1f(glGetUniformLocation(self.earthShader, "twilightWidth"), 0.15)
                 glUniform1f(glGetUniformLocation(self.earthShader, "nightIntensity"), 1.0)
-                gluQuadricTexture(self.sphere, GL_TRUE)
-                gluSphere(self.sphere, 1.0, 96, 64)
+                self._drawEarthSphere()
                 glUseProgram(0)
 
                 glDisable(GL_LIGHTING)
@@ -185,110 +208,255 @@ class View3dWidget(QOpenGLWidget):
                 glPopMatrix()
 
     @staticmethod
-    def _drawAxes(redColor, greenColor, blueColor):
-        L = 2.5
-        glLineWidth(3)
-        glBegin(GL_LINES)
-        # X – VERNAL EQUINOX
-        glColor3f(*redColor)
-        glVertex3f(0, 0, 0)
-        glVertex3f(L, 0, 0)
-        # Y – NORTH POLE
-        glColor3f(*greenColor)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, L, 0)
-        # Z – EAST
-        glColor3f(*blueColor)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, 0, L)
-        glEnd()
+    def _createStaticBuffer(data, target=GL_ARRAY_BUFFER):
+        buffer = glGenBuffers(1)
+        glBindBuffer(target, buffer)
+        glBufferData(target, data.nbytes, data, GL_STATIC_DRAW)
+        glBindBuffer(target, 0)
+        return buffer
+
+    def _buildStaticGeometry(self):
+        gridVertices, self.gridRanges = self._earthGridGeometry()
+        earthPositions, earthTexCoords, earthIndices = self._earthSphereGeometry()
+        self.earthIndexCount = earthIndices.size
+        axesVertices = np.zeros((6, 3), dtype=np.float32)
+        axesVertices[1::2] = 2.5 * np.eye(3)
+        self.staticBuffers = {'GRID': self._createStaticBuffer(gridVertices), 'AXES': self._createStaticBuffer(axesVertices),
+                              'SKYBOX': self._createStaticBuffer(self._skyboxGeometry()),
+                              'EARTH_POSITION': self._createStaticBuffer(earthPositions), 'EARTH_TEXCOORD': self._createStaticBuffer(earthTexCoords),
+                              'EARTH_INDEX': self._createStaticBuffer(earthIndices, GL_ELEMENT_ARRAY_BUFFER)}
 
     @staticmethod
-    def _drawEarthGrid(radius=1.001):
+    def _earthGridGeometry(radius=1.001):
         LAT_STEP = 15
         LON_STEP = 15
         SEGMENTS = 360
+        # PARALLELS AS CLOSED LOOPS, MERIDIANS AS POLE TO POLE STRIPS
+        loopLatitudes, loopLongitudes = np.meshgrid(np.radians(np.arange(-90 + LAT_STEP, 90, LAT_STEP)), 2 * np.pi * np.arange(SEGMENTS) / SEGMENTS, indexing='ij')
+        stripLongitudes, stripLatitudes = np.meshgrid(np.radians(np.arange(0, 360, LON_STEP)), np.radians(np.arange(-90, 91, 5)), indexing='ij')
+        latitudes = np.concatenate((loopLatitudes.ravel(), stripLatitudes.ravel()))
+        longitudes = np.concatenate((loopLongitudes.ravel(), stripLongitudes.ravel()))
+        vertices = radius * np.stack((np.cos(latitudes) * np.cos(longitudes), np.sin(latitudes), np.cos(latitudes) * np.sin(longitudes)), axis=-1)
+        loopCounts = np.full(loopLatitudes.shape[0], loopLatitudes.shape[1], dtype=np.int32)
+        stripCounts = np.full(stripLatitudes.shape[0], stripLatitudes.shape[1], dtype=np.int32)
+        loopFirsts = (np.cumsum(loopCounts) - loopCounts).astype(np.int32)
+        stripFirsts = (loopLatitudes.size + np.cumsum(stripCounts) - stripCounts).astype(np.int32)
+        return vertices.astype(np.float32), [(GL_LINE_LOOP, loopFirsts, loopCounts), (GL_LINE_STRIP, stripFirsts, stripCounts)]
+
+    @staticmethod
+    def _earthSphereGeometry(slices=96, stacks=64):
+        # SAME VERTICES, NORMALS & TEXTURE COORDINATES AS gluSphere(quadric, 1.0, slices, stacks)
+        sliceIndices, stackIndices = np.arange(slices + 1), np.arange(stacks + 1)
+        theta, rho = 2 * np.pi * (sliceIndices % slices) / slices, np.pi * stackIndices / stacks
+        sinRho, cosRho = np.sin(rho), np.cos(rho)
+        sinRho[[0, -1]] = 0
+        positions = np.stack(np.broadcast_arrays(sinRho[:, None] * np.sin(theta), sinRho[:, None] * np.cos(theta), cosRho[:, None]), axis=-1)
+        texCoords = np.stack(np.broadcast_arrays(1 - sliceIndices / slices, 1 - stackIndices[:, None] / stacks), axis=-1)
+        # TWO TRIANGLES PER QUAD, SAME WINDING AS THE GLU QUAD STRIPS
+        lower = (np.arange(stacks)[:, None] * (slices + 1) + np.arange(slices)).ravel()
+        upper = lower + slices + 1
+        indices = np.stack((upper, lower, upper + 1, upper + 1, lower, lower + 1), axis=-1)
+        return positions.reshape(-1, 3).astype(np.float32), texCoords.reshape(-1, 2).astype(np.float32), indices.ravel().astype(np.uint32)
+
+    @staticmethod
+    def _skyboxGeometry():
+        # UNIT CUBE FACES (+X, -X, +Y, -Y, +Z, -Z), ALSO USED AS CUBE MAP TEXTURE COORDINATES
+        return np.array([[1, -1, -1], [1, -1, 1], [1, 1, 1], [1, 1, -1],
+                         [-1, -1, 1], [-1, -1, -1], [-1, 1, -1], [-1, 1, 1],
+                         [-1, 1, -1], [1, 1, -1], [1, 1, 1], [-1, 1, 1],
+                         [-1, -1, 1], [1, -1, 1], [1, -1, -1], [-1, -1, -1],
+                         [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],
+                         [1, -1, -1], [-1, -1, -1], [-1, 1, -1], [1, 1, -1]], dtype=np.float32)
+
+    def _drawAxes(self, redColor, greenColor, blueColor):
+        # X – VERNAL EQUINOX, Y – NORTH POLE, Z – EAST
+        glLineWidth(3)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.staticBuffers['AXES'])
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        for axis, color in enumerate((redColor, greenColor, blueColor)):
+            glColor3f(*color)
+            glDrawArrays(GL_LINES, 2 * axis, 2)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def _drawEarthGrid(self):
         glColor3f(0.8, 0.8, 1.0)
         glLineWidth(1)
-        for lat_deg in range(-90 + LAT_STEP, 90, LAT_STEP):
-            lat_rad = np.radians(lat_deg)
-            glBegin(GL_LINE_LOOP)
-            for i in range(SEGMENTS):
-                lon_rad = 2 * np.pi * i / SEGMENTS
-                xGrid = radius * np.cos(lat_rad) * np.cos(lon_rad)
-                yGrid = radius * np.sin(lat_rad)
-                zGrid = radius * np.cos(lat_rad) * np.sin(lon_rad)
-                glVertex3f(xGrid, yGrid, zGrid)
-            glEnd()
-        for lon_deg in range(0, 360, LON_STEP):
-            lon_rad = np.radians(lon_deg)
-            glBegin(GL_LINE_STRIP)
-            for lat_deg in range(-90, 91, 5):
-                lat_rad = np.radians(lat_deg)
-                xGrid = radius * np.cos(lat_rad) * np.cos(lon_rad)
-                yGrid = radius * np.sin(lat_rad)
-                zGrid = radius * np.cos(lat_rad) * np.sin(lon_rad)
-                glVertex3f(xGrid, yGrid, zGrid)
-            glEnd()
-
-    def _drawObject(self, noradIndex):
-        isSelected = (noradIndex == self.selectedObject)
-        isHovered = (noradIndex == self.hoveredObject)
-        isActive = isSelected or isHovered
-        noradObjectConfiguration = self.displayConfiguration['OBJECTS'][str(noradIndex)]
-        # ORBITAL PATH
-        orbitColor, orbitWidth = noradObjectConfiguration['ORBIT']['COLOR'] if isActive else (1, 1, 1, 1), noradObjectConfiguration['ORBIT']['WIDTH']
-        if self._shouldRender(noradObjectConfiguration['ORBIT']['MODE'], isSelected, self.displayConfiguration['SHOW_ORBITS']):
-            glLineWidth(orbitWidth)
-            glColor4f(*orbitColor)
-            glBegin(GL_LINE_STRIP)
-            for point in self.objectOrbitData[str(noradIndex)]:
-                point = point / self.EARTH_RADIUS
-                glVertex3f(point[0], point[1], point[2])
-            glEnd()
-        # OBJECT SPOT
-        spotColor = tuple(noradObjectConfiguration['SPOT']['COLOR']) if isActive else (1, 1, 1, 1)
-        glPointSize(noradObjectConfiguration['SPOT']['SIZE'])
-        glColor4f(*spotColor)
-        glBegin(GL_POINTS)
-        position = self.objectSpotData[str(noradIndex)] / self.EARTH_RADIUS
-        glVertex3f(position[0], position[1], position[2])
-        glEnd()
-        # OBJECT LABEL
-        if isActive:
-            objectName = self.objectNameData.get(str(noradIndex), 'NONE')
-            viewModel = (GLdouble * 16)()
-            viewProjection = (GLdouble * 16)()
-            viewPort = (GLint * 4)()
-            glGetDoublev(GL_MODELVIEW_MATRIX, viewModel)
-            glGetDoublev(GL_PROJECTION_MATRIX, viewProjection)
-            glGetIntegerv(GL_VIEWPORT, viewPort)
-            xWindow, yWindow, zWindow = gluProject(position[0], position[1], position[2], viewModel, viewProjection, viewPort)
-            if zWindow <= 0.0 or zWindow >= 1.0:
-                return
-            try:
-                glMatrixMode(GL_PROJECTION)
-                glPushMatrix()
-                glLoadIdentity()
-                glOrtho(0, viewPort[2], 0, viewPort[3], -1, 1)
-                glMatrixMode(GL_MODELVIEW)
-                glPushMatrix()
-                glLoadIdentity()
-                glActiveTexture(GL_TEXTURE1)
-                glDisable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, 0)
-                glActiveTexture(GL_TEXTURE0)
-                glDisable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, 0)
-                glColor4f(1, 1, 1, 1)
-                glRasterPos2f(xWindow + 5, yWindow + 5)
-                for char in objectName:
-                    glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, ord(char))
-            finally:
-                glMatrixMode(GL_PROJECTION)
-                glPopMatrix()
-                glMatrixMode(GL_MODELVIEW)
-                glPopMatrix()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.staticBuffers['GRID'])
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        for mode, firsts, counts in self.gridRanges:
+            glMultiDrawArrays(mode, firsts, counts, firsts.size)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def _drawEarthSphere(self):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glClientActiveTexture(GL_TEXTURE0)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        # UNIT SPHERE : POSITIONS DOUBLE AS NORMALS
+        glBindBuffer(GL_ARRAY_BUFFER, self.staticBuffers['EARTH_POSITION'])
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glNormalPointer(GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, self.staticBuffers['EARTH_TEXCOORD'])
+        glTexCoordPointer(2, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.staticBuffers['EARTH_INDEX'])
+        glDrawElements(GL_TRIANGLES, self.earthIndexCount, GL_UNSIGNED_INT, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def _uploadBuffer(self, name, data):
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        if name not in self.vertexBuffers:
+            self.vertexBuffers[name] = [glGenBuffers(1), 0]
+        buffer, capacity = self.vertexBuffers[name]
+        glBindBuffer(GL_ARRAY_BUFFER, buffer)
+        if data.nbytes > capacity:
+            # GROWTH ONLY : SMALLER UPDATES REUSE THE EXISTING STORAGE
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
+            self.vertexBuffers[name][1] = data.nbytes
+        elif data.nbytes:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _rebuildObjectBuffers(self):
+        # PACKED VERTEX DATA, SCALED TO EARTH RADII, UPLOADED ON THE NEXT FRAME
+        objectsConfiguration = self.displayConfiguration.get('OBJECTS', {})
+        drawnNorads = [noradIndex for noradIndex in self.visibleNorads if objectsConfiguration.get(str(noradIndex), False)]
+        # SPOTS : PACKED (N, 3) POSITIONS WITH PER-OBJECT SIZE, DRAWN IN ONE CALL
+        self.spotNorads, self.spotCount = drawnNorads, len(drawnNorads)
+        self.spotRows = {noradIndex: row for row, noradIndex in enumerate(self.spotNorads)}
+        self.pendingUploads['SPOT_SIZE'] = [objectsConfiguration[str(noradIndex)]['SPOT']['SIZE'] for noradIndex in drawnNorads]
+        # OBJECTS WITHOUT A SEGMENT STAY AT THEIR WORKER POSITION
+        spotSegments = np.zeros((len(self.spotNorads), 4, 3))
+        for row, noradIndex in enumerate(self.spotNorads):
+            if str(noradIndex) in self.objectSegmentData:
+                spotSegments[row] = self.objectSegmentData[str(noradIndex)]
+            else:
+                spotSegments[row, 0] = self.objectSpotData[str(noradIndex)]
+        self.spotSegments = spotSegments / self.EARTH_RADIUS
+        self._interpolateSpots()
+        # ORBIT PATHS CONCATENATED, ONE (FIRST, COUNT) RANGE PER OBJECT
+        self.orbitNorads = [noradIndex for noradIndex in drawnNorads if str(noradIndex) in self.objectOrbitData]
+        orbitPaths = [np.asarray(self.objectOrbitData[str(noradIndex)], dtype=float).reshape(-1, 3) for noradIndex in self.orbitNorads]
+        self.orbitCounts = np.array([len(path) for path in orbitPaths], dtype=np.int32)
+        self.orbitFirsts = (np.cumsum(self.orbitCounts) - self.orbitCounts).astype(np.int32)
+        self.pendingUploads['ORBIT_POSITION'] = (np.concatenate(orbitPaths) if orbitPaths else np.zeros((0, 3))) / self.EARTH_RADIUS
+        self._updateObjectStyles()
+
+    def _interpolateSpots(self):
+        elapsed = 0.0 if self.clock is None or self.segmentStart is None else (self.clock.estimateTime() - self.segmentStart).total_seconds()
+        # NO EXTRAPOLATION PAST THE SEGMENT : OBJECTS WAIT FOR THE NEXT WORKER UPDATE
+        elapsed = min(max(elapsed, 0.0), self.segmentDuration)
+        u = elapsed / self.segmentDuration
+        self.spotPositions = ((self.spotSegments[:, 3] * u + self.spotSegments[:, 2]) * u + self.spotSegments[:, 1]) * u + self.spotSegments[:, 0]
+        self.pendingUploads['SPOT_POSITION'] = self.spotPositions
+        self.spotVersion += 1
+        self.gmstAngle = np.rad2deg(self.segmentGmst + self.EARTH_ROTATION_RATE * elapsed)
+
+    def setClock(self, clock):
+        self.clock = clock
+        self.frameTimer.start(self.FRAME_INTERVAL)
+
+    def _onFrameTimer(self):
+        if self.isVisible() and self.clock is not None and self.clock.running and self.segmentStart is not None:
+            self._interpolateSpots()
+            self.update()
+
+    def _updateObjectStyles(self):
+        # COLORS & ORBIT BATCHES DEPEND ON SELECTION AND HOVER ONLY, POSITIONS STAY ON THE GPU
+        objectsConfiguration = self.displayConfiguration.get('OBJECTS', {})
+        spotColors = np.ones((len(self.spotNorads), 4))
+        for noradIndex in (self.selectedObject, self.hoveredObject):
+            if noradIndex in self.spotRows:
+                spotColors[self.spotRows[noradIndex]] = objectsConfiguration[str(noradIndex)]['SPOT']['COLOR']
+        self.pendingUploads['SPOT_COLOR'] = spotColors
+        # ORBITS GROUPED BY (WIDTH, COLOR) : ONE MULTI-DRAW PER GROUP
+        batches = {}
+        for row, noradIndex in enumerate(self.orbitNorads):
+            isSelected = (noradIndex == self.selectedObject)
+            isActive = isSelected or (noradIndex == self.hoveredObject)
+            orbitConfiguration = objectsConfiguration[str(noradIndex)]['ORBIT']
+            if self._shouldRender(orbitConfiguration['MODE'], isSelected, self.displayConfiguration['SHOW_ORBITS']):
+                orbitColor = tuple(orbitConfiguration['COLOR']) if isActive else (1, 1, 1, 1)
+                batches.setdefault((orbitConfiguration['WIDTH'], orbitColor), []).append(row)
+        self.orbitBatches = [(width, color, self.orbitFirsts[rows], self.orbitCounts[rows]) for (width, color), rows in batches.items()]
+
+    def _drawObjects(self):
+        for name, data in self.pendingUploads.items():
+            self._uploadBuffer(name, data)
+        self.pendingUploads = {}
+        glEnableClientState(GL_VERTEX_ARRAY)
+        # ORBITAL PATHS
+        if self.orbitBatches:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vertexBuffers['ORBIT_POSITION'][0])
+            glVertexPointer(3, GL_FLOAT, 0, None)
+            for width, color, firsts, counts in self.orbitBatches:
+                glLineWidth(width)
+                glColor4f(*color)
+                glMultiDrawArrays(GL_LINE_STRIP, firsts, counts, firsts.size)
+        # OBJECT SPOTS
+        if self.spotCount:
+            glUseProgram(self.spotShader)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glEnableVertexAttribArray(self.spotSizeLocation)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vertexBuffers['SPOT_POSITION'][0])
+            glVertexPointer(3, GL_FLOAT, 0, None)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vertexBuffers['SPOT_COLOR'][0])
+            glColorPointer(4, GL_FLOAT, 0, None)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vertexBuffers['SPOT_SIZE'][0])
+            glVertexAttribPointer(self.spotSizeLocation, 1, GL_FLOAT, GL_FALSE, 0, None)
+            glDrawArrays(GL_POINTS, 0, self.spotCount)
+            glDisableVertexAttribArray(self.spotSizeLocation)
+            glDisableClientState(GL_COLOR_ARRAY)
+            glUseProgram(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        # OBJECT LABELS
+        for noradIndex in {self.selectedObject, self.hoveredObject}:
+            if noradIndex in self.spotRows:
+                self._drawLabel(noradIndex)
+
+    def _drawLabel(self, noradIndex):
+        position = self.spotPositions[self.spotRows[noradIndex]]
+        objectName = self.objectNameData.get(str(noradIndex), 'NONE')
+        viewModel = (GLdouble * 16)()
+        viewProjection = (GLdouble * 16)()
+        viewPort = (GLint * 4)()
+        glGetDoublev(GL_MODELVIEW_MATRIX, viewModel)
+        glGetDoublev(GL_PROJECTION_MATRIX, viewProjection)
+        glGetIntegerv(GL_VIEWPORT, viewPort)
+        xWindow, yWindow, zWindow = gluProject(position[0], position[1], position[2], viewModel, viewProjection, viewPort)
+        if zWindow <= 0.0 or zWindow >= 1.0:
+            return
+        try:
+            glMatrixMode(GL_PROJECTION)
+            glPushMatrix()
+            glLoadIdentity()
+            glOrtho(0, viewPort[2], 0, viewPort[3], -1, 1)
+            glMatrixMode(GL_MODELVIEW)
+            glPushMatrix()
+            glLoadIdentity()
+            glActiveTexture(GL_TEXTURE1)
+            glDisable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glActiveTexture(GL_TEXTURE0)
+            glDisable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glColor4f(1, 1, 1, 1)
+            glRasterPos2f(xWindow + 5, yWindow + 5)
+            for char in objectName:
+                glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, ord(char))
+        finally:
+            glMatrixMode(GL_PROJECTION)
+            glPopMatrix()
+            glMatrixMode(GL_MODELVIEW)
+            glPopMatrix()
 
     @staticmethod
     def _shouldRender(mode: str, isSelected: bool, isToggled: bool = True):
@@ -301,80 +469,42 @@ class View3dWidget(QOpenGLWidget):
         return False  # NEVER
 
     def updateData(self, positions: dict, visibleNorads: set[int], selectedNorad: int | None, displayConfiguration: dict):
+        visibleNorads = [noradIndex for noradIndex in visibleNorads if noradIndex in positions['3D_VIEW']['OBJECTS']]
         self.selectedObject, self.displayConfiguration, self.visibleNorads = selectedNorad, displayConfiguration, visibleNorads
-        self.gmstAngle = np.rad2deg(positions['3D_VIEW']['GMST'])
+        self.segmentGmst = positions['3D_VIEW']['GMST']
+        self.segmentStart, self.segmentDuration = positions['3D_VIEW'].get('SEGMENT_START'), positions['3D_VIEW'].get('SEGMENT_DURATION', 1.0)
         self.sunDirection = positions['3D_VIEW']['SUN_DIRECTION_ECEF']
         self.objectSpotData = {str(noradIndex): positions['3D_VIEW']['OBJECTS'][noradIndex]['POSITION']['R_ECI'] for noradIndex in visibleNorads}
-        self.objectOrbitData = {str(noradIndex): positions['3D_VIEW']['OBJECTS'][noradIndex]['ORBIT_PATH'] for noradIndex in visibleNorads}
+        self.objectOrbitData = {str(noradIndex): positions['3D_VIEW']['OBJECTS'][noradIndex]['ORBIT_PATH'] for noradIndex in visibleNorads if 'ORBIT_PATH' in positions['3D_VIEW']['OBJECTS'][noradIndex]}
         self.objectNameData = {str(noradIndex): positions['3D_VIEW']['OBJECTS'][noradIndex]['NAME'] for noradIndex in visibleNorads}
+        self.objectSegmentData = {str(noradIndex): positions['3D_VIEW']['OBJECTS'][noradIndex]['SEGMENT'] for noradIndex in visibleNorads if 'SEGMENT' in positions['3D_VIEW']['OBJECTS'][noradIndex]}
+        self._rebuildObjectBuffers()
         self.update()
 
-    def _detectHover(self, event):
-        xMouse = event.x()
-        yMouse = self.height() - event.y()
-        self.makeCurrent()
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluPerspective(45, self.width() / max(self.height(), 1), 0.1, 1000)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        glTranslatef(0, 0, -self.zoom)
-        glRotatef(self.rotX, 1, 0, 0)
-        glRotatef(self.rotY, 0, 1, 0)
-        glRotatef(-90, 1, 0, 0)
-
-        viewModel = (GLdouble * 16)()
-        viewProjection = (GLdouble * 16)()
-        viewPort = (GLint * 4)()
-        glGetDoublev(GL_MODELVIEW_MATRIX, viewModel)
-        glGetDoublev(GL_PROJECTION_MATRIX, viewProjection)
-        glGetIntegerv(GL_VIEWPORT, viewPort)
-        minimumDistance = float('inf')
-        hovered = None
-        threshold = 20.0
-        for noradIndex in self.visibleNorads:
-            position = self.objectSpotData[str(noradIndex)] / self.EARTH_RADIUS
-            xWindow, yWindow, _ = gluProject(position[0], position[1], position[2], viewModel, viewProjection, viewPort)
-            distance = np.sqrt((xWindow - xMouse) ** 2 + (yWindow - yMouse) ** 2)
-            if distance < minimumDistance and distance < threshold:
-                minimumDistance = distance
-                hovered = noradIndex
-        return hovered
+    def _modelViewProjection(self, width, height):
+        # SAME TRANSFORMS AS resizeGL & paintGL, UP TO THE OBJECTS' ECI FRAME
+        projection = ScreenPicker.perspectiveMatrix(45, width / max(height, 1), 0.1, 1000)
+        modelView = ScreenPicker.translationMatrix(0, 0, -self.zoom) @ ScreenPicker.rotationMatrix(self.rotX, 1, 0, 0) \
+            @ ScreenPicker.rotationMatrix(self.rotY, 0, 1, 0) @ ScreenPicker.rotationMatrix(-90, 1, 0, 0)
+        return projection @ modelView
+
+    def _pickObject(self, event):
+        # SCREEN POSITIONS PROJECTED ONCE PER CAMERA OR OBJECTS CHANGE, THEN GRID LOOKUPS
+        width, height = self.width(), self.height()
+        key = (self.spotVersion, self.zoom, self.rotX, self.rotY, width, height)
+        if key != self.picker.key:
+            self.picker.build(self.spotPositions, self._modelViewProjection(width, height), width, height, key)
+        row = self.picker.nearest(event.x(), height - event.y())
+        return None if row is None else self.spotNorads[row]
 
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.LeftButton:
             self.lastPosX = event.x()
             self.lastPosY = event.y()
-            xMouse, yMouse = event.x(), self.height() - event.y()
-            self.makeCurrent()
-            glMatrixMode(GL_PROJECTION)
-            glLoadIdentity()
-            gluPerspective(45, self.width() / max(self.height(), 1), 0.1, 1000)
-            glMatrixMode(GL_MODELVIEW)
-            glLoadIdentity()
-            glTranslatef(0, 0, -self.zoom)
-            glRotatef(self.rotX, 1, 0, 0)
-            glRotatef(self.rotY, 0, 1, 0)
-            glRotatef(-90, 1, 0, 0)
-
-            viewModel = (GLdouble * 16)()
-            viewProjection = (GLdouble * 16)()
-            viewPort = (GLint * 4)()
-            glGetDoublev(GL_MODELVIEW_MATRIX, viewModel)
-            glGetDoublev(GL_PROJECTION_MATRIX, viewProjection)
-            glGetIntegerv(GL_VIEWPORT, viewPort)
-            minimumDistance = float('inf')
-            selectedObject = None
-            threshold = 20.0
-            for noradIndex in self.visibleNorads:
-                position = self.objectSpotData[str(noradIndex)] / self.EARTH_RADIUS
-                xWindow, yWindow, zWindow = gluProject(position[0], position[1], position[2], viewModel, viewProjection, viewPort)
-                distance = np.sqrt((xWindow - xMouse) ** 2 + (yWindow - yMouse) ** 2)
-                if distance < minimumDistance and distance < threshold:
-                    minimumDistance = distance
-                    selectedObject = noradIndex
+            selectedObject = self._pickObject(event)
             if selectedObject is not None:
                 self.selectedObject = selectedObject
+                self._updateObjectStyles()
                 self.objectSelected.emit([selectedObject])
                 self.update()
 
@@ -388,9 +518,11 @@ class View3dWidget(QOpenGLWidget):
             self.update()
             return
         # HOVER DETECTION
-        hovered = self._detectHover(event)
-        self.hoveredObject = hovered
-        self.update()
+        hovered = self._pickObject(event)
+        if hovered != self.hoveredObject:
+            self.hoveredObject = hovered
+            self._updateObjectStyles()
+            self.update()
 
     def wheelEvent(self, event: QWheelEvent):
         delta = event.angleDelta().y() / 120.0
@@ -423,69 +555,18 @@ class View3dWidget(QOpenGLWidget):
         glEnable(GL_TEXTURE_CUBE_MAP)
         glBindTexture(GL_TEXTURE_CUBE_MAP, self.skyboxTexture)
         glColor4f(1, 1, 1, 0.2)
-        glBegin(GL_QUADS)
-
-        # +X FACE
-        glTexCoord3f(1, -1, -1)
-        glVertex3f(size, -size, -size)
-        glTexCoord3f(1, -1, 1)
-        glVertex3f(size, -size, size)
-        glTexCoord3f(1, 1, 1)
-        glVertex3f(size, size, size)
-        glTexCoord3f(1, 1, -1)
-        glVertex3f(size, size, -size)
-
-        # -X FACE
-        glTexCoord3f(-1, -1, 1)
-        glVertex3f(-size, -size, size)
-        glTexCoord3f(-1, -1, -1)
-        glVertex3f(-size, -size, -size)
-        glTexCoord3f(-1, 1, -1)
-        glVertex3f(-size, size, -size)
-        glTexCoord3f(-1, 1, 1)
-        glVertex3f(-size, size, size)
-
-        # +Y FACE
-        glTexCoord3f(-1, 1, -1)
-        glVertex3f(-size, size, -size)
-        glTexCoord3f(1, 1, -1)
-        glVertex3f(size, size, -size)
-        glTexCoord3f(1, 1, 1)
-        glVertex3f(size, size, size)
-        glTexCoord3f(-1, 1, 1)
-        glVertex3f(-size, size, size)
-
-        # -Y FACE
-        glTexCoord3f(-1, -1, 1)
-        glVertex3f(-size, -size, size)
-        glTexCoord3f(1, -1, 1)
-        glVertex3f(size, -size, size)
-        glTexCoord3f(1, -1, -1)
-        glVertex3f(size, -size, -size)
-        glTexCoord3f(-1, -1, -1)
-        glVertex3f(-size, -size, -size)
-
-        # +Z FACE
-        glTexCoord3f(-1, -1, 1)
-        glVertex3f(-size, -size, size)
-        glTexCoord3f(1, -1, 1)
-        glVertex3f(size, -size, size)
-        glTexCoord3f(1, 1, 1)
-        glVertex3f(size, size, size)
-        glTexCoord3f(-1, 1, 1)
-        glVertex3f(-size, size, size)
-
-        # -Z FACE
-        glTexCoord3f(1, -1, -1)
-        glVertex3f(size, -size, -size)
-        glTexCoord3f(-1, -1, -1)
-        glVertex3f(-size, -size, -size)
-        glTexCoord3f(-1, 1, -1)
-        glVertex3f(-size, size, -size)
-        glTexCoord3f(1, 1, -1)
-        glVertex3f(size, size, -size)
-
-        glEnd()
+        glPushMatrix()
+        glScalef(size, size, size)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.staticBuffers['SKYBOX'])
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glTexCoordPointer(3, GL_FLOAT, 0, None)
+        glDrawArrays(GL_QUADS, 0, 24)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glPopMatrix()
 
         glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
         glDisable(GL_TEXTURE_CUBE_MAP)
@@ -499,12 +580,16 @@ class View3dWidget(QOpenGLWidget):
                     glDeleteTextures([self.earthTextureIndex])
                 if self.lightsTextureIndex:
                     glDeleteTextures([self.lightsTextureIndex])
-                if self.sphere:
-                    gluDeleteQuadric(self.sphere)
                 if self.earthShader:
                     glDeleteProgram(self.earthShader)
+                if self.spotShader:
+                    glDeleteProgram(self.spotShader)
                 if self.skyboxTexture:
                     glDeleteTextures([self.skyboxTexture])
+                if self.staticBuffers:
+                    glDeleteBuffers(len(self.staticBuffers), list(self.staticBuffers.values()))
+                if self.vertexBuffers:
+                    glDeleteBuffers(len(self.vertexBuffers), [buffer for buffer, _ in self.vertexBuffers.values()])
                 self.doneCurrent()
         except RuntimeError:
             pass
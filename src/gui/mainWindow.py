@@ -1,6 +1,6 @@
 import copy
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import numpy as np
 import qdarktheme
@@ -14,11 +14,15 @@ from PyQt5.QtCore import Qt, QDateTime, QTimer, QPoint, pyqtSignal, QThread, QSi
 from PyQt5.QtWidgets import *
 
 from gui.earth3D import View3dWidget, Object3dViewConfigDockWidget
+from src.core.tleDatabase import TLERefreshWorker
 from src.gui.objects import SimulationClock, AddObjectDialog, OrbitWorker, TimelineWidget
 from src.gui.utilities import generateDefaultSettingsJson, loadSettingsJson, saveSettingsJson, getKeyFromValue
 
 
 class MainWindow(QMainWindow):
+    refreshRequested = pyqtSignal()
+    REFRESH_CHECK_INTERVAL = 3600 * 1000
+
     def __init__(self, currentDIr: str):
         super().__init__()
         self.settings = {}
@@ -59,6 +63,7 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.RightDockWidgetArea, self.object3dViewConfigDock)
 
         self.tleDatabase = None
+        self.refreshThread, self.refreshWorker = None, None
         self._createIcons()
         self._createActions()
         self._createMenuBar()
@@ -270,6 +275,9 @@ class MainWindow(QMainWindow):
         self.fpsLabel = QLabel('Fps : ---')
         self.fpsLabel.setStyleSheet('border: 0;')
         self.statusBar().addPermanentWidget(self.fpsLabel)
+        self.tickLabel = QLabel('Ticks : ---')
+        self.tickLabel.setStyleSheet('border: 0;')
+        self.statusBar().addPermanentWidget(self.tickLabel)
         self.datetime = QDateTime.currentDateTime()
         self.dateLabel = QLabel(self.datetime.toString('dd.MM.yyyy  hh:mm:ss'))
         self.dateLabel.setStyleSheet('border: 0;')
@@ -286,11 +294,15 @@ class MainWindow(QMainWindow):
 
     def _restoreWindow(self):
         self.setWindowTitle('Satellite Tracker')
+        g = self.settings['WINDOW']['GEOMETRY']
+        self.setGeometry(g['X'], g['Y'], g['WIDTH'], g['HEIGHT'])
+
+    def showRestored(self):
+        # SHOWN ONLY ONCE A FIRST DATABASE IS PUBLISHED, NOT WHILE THE SPLASH IS UP
         if self.settings['WINDOW']['MAXIMIZED']:
             self.showMaximized()
         else:
-            g = self.settings['WINDOW']['GEOMETRY']
-            self.setGeometry(g['X'], g['Y'], g['WIDTH'], g['HEIGHT'])
+            self.show()
 
     def _updateStatus(self):
         self.datetime = QDateTime.currentDateTime()
@@ -300,6 +312,12 @@ class MainWindow(QMainWindow):
         self.lastUpdate = now
         self.avgFps = self.avgFps * 0.8 + fps * 0.2
         self.fpsLabel.setText('Fps : %0.2f ' % self.avgFps)
+        tickStatistics = self.centralViewWidget.orbitWorker.tickStatistics()
+        self.tickLabel.setText(f"Ticks : {tickStatistics['PROCESSED']} ({tickStatistics['SKIPPED']} skipped)")
+        if self.tleDatabase is not None:
+            cacheStatistics = self.tleDatabase.satrecCache.statistics()
+            self.tickLabel.setToolTip(f"SGP4 cache : {cacheStatistics['SIZE']}/{cacheStatistics['CAPACITY']} objects, {cacheStatistics['HITS']} hits, "
+                                      f"{cacheStatistics['MISSES']} misses, {cacheStatistics['EVICTIONS']} evictions, {cacheStatistics['INVALIDATIONS']} invalidations")
 
     def _checkEnvironment(self):
         if not os.path.exists(self.settingsPath):
@@ -312,6 +330,9 @@ class MainWindow(QMainWindow):
     def setDatabase(self, database):
         self.tleDatabase = database
         self.centralViewWidget.setDatabase(database)
+        computationSettings = self.settings.get('COMPUTATION', {})
+        self.centralViewWidget.setProcessCount(computationSettings.get('PROCESSES', 0), computationSettings.get('POOL_THRESHOLD', 500))
+        database.satrecCache.setCapacity(computationSettings.get('SATREC_CACHE_SIZE', database.SATREC_CACHE_SIZE))
         self.centralViewWidget.set2dMapConfiguration(copy.deepcopy(self.settings['2D_MAP']))
         self.centralViewWidget.set3dViewConfiguration(copy.deepcopy(self.settings['3D_VIEW']))
         self.objectListDock.populate(self.tleDatabase, self.activeObjects)
@@ -322,6 +343,34 @@ class MainWindow(QMainWindow):
         self.centralViewWidget.tabChanged.connect(self._updateTabs)
         self.setObjectConfigWidgetsVisibility()
 
+    def startAutoRefresh(self):
+        # PERIODIC CHECK, THE DOWNLOADS THEMSELVES ONLY HAPPEN ONCE THE GROUPS ARE OLDER THAN THE UPDATE INTERVAL
+        dataSettings = self.settings['DATA']
+        if self.refreshThread is not None or not dataSettings.get('AUTO_DOWNLOAD', True):
+            return
+        self.refreshThread = QThread(self)
+        self.refreshWorker = TLERefreshWorker(self.dataPath, updateInterval=timedelta(days=dataSettings['UPDATE_INTERNAL_DAYS']))
+        self.refreshWorker.moveToThread(self.refreshThread)
+        self.refreshRequested.connect(self.refreshWorker.refresh)
+        self.refreshWorker.databaseUpdated.connect(self.updateDatabase)
+        self.refreshWorker.status.connect(self.statusBar().showMessage)
+        self.refreshThread.start()
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.timeout.connect(self.refreshRequested.emit)
+        self.refreshTimer.start(self.REFRESH_CHECK_INTERVAL)
+
+    def updateDatabase(self, database):
+        # LATER LOADING STAGES : SWAP THE CATALOG WITHOUT RESETTING THE VIEWS, KEEPING THE EPOCH VALIDATED SATREC CACHE
+        database.satrecCache = self.tleDatabase.satrecCache
+        self.tleDatabase = database
+        self.centralViewWidget.setDatabase(database)
+        self.objectListDock.populate(self.tleDatabase, self.activeObjects)
+        if self.selectedObject is not None:
+            self.objectListDock.selectNoradIndex(self.selectedObject)
+            row = self.tleDatabase.getObjectRow(self.selectedObject)
+            if row is not None:
+                self.objectInfoDock.setObject(row)
+
     def setObjectConfigWidgetsVisibility(self):
         if self.settings['VISUALIZATION']['CURRENT_TAB'] == '2D_MAP':
             self.object2dMapConfigDock.setVisible(True)
@@ -388,9 +437,9 @@ class MainWindow(QMainWindow):
             self.centralViewWidget.setSelectedObject(None)
             self._updateActionStates()
             return
-        row = self.tleDatabase.dataFrame.loc[self.tleDatabase.dataFrame['NORAD_CAT_ID'].astype(int) == self.selectedObject]
-        if not row.empty:
-            self.objectInfoDock.setObject(row.iloc[0])
+        row = self.tleDatabase.getObjectRow(self.selectedObject)
+        if row is not None:
+            self.objectInfoDock.setObject(row)
         else:
             self.objectInfoDock.clear()
         self.centralViewWidget.setSelectedObject(self.selectedObject)
@@ -439,6 +488,10 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self.centralViewWidget.close()
+        if self.refreshThread is not None:
+            self.refreshTimer.stop()
+            self.refreshThread.quit()
+            self.refreshThread.wait()
         # SAVING SETTINGS
         self.settings['WINDOW']['MAXIMIZED'] = self.isMaximized()
         if not self.isMaximized():
@@ -606,30 +659,31 @@ class Map2dWidget(QWidget):
         # GROUND TRACKS
         groundTrackColor, groundTrackWidth = noradObjectConfiguration['GROUND_TRACK']['COLOR'], noradObjectConfiguration['GROUND_TRACK']['WIDTH']
         if self._shouldRender(noradObjectConfiguration['GROUND_TRACK']['MODE'], isSelected, self.displayConfiguration['SHOW_GROUND_TRACK']):
-            groundLongitudes, groundLatitudes = noradPosition['GROUND_TRACK']['LONGITUDE'], noradPosition['GROUND_TRACK']['LATITUDE']
-            groundSegments = self._splitWrapSegment(groundLongitudes, groundLatitudes)
-            for item in self.objectGroundTracks.get(noradIndex, []):
-                self.plot.removeItem(item)
-            self.objectGroundTracks[noradIndex] = []
-            for segmentLongitudes, segmentLatitudes in groundSegments:
-                gx, gy = self._lonlatToCartesian(segmentLongitudes, segmentLatitudes)
-                curve = pg.PlotCurveItem(gx, gy, pen=pg.mkPen(groundTrackColor, width=groundTrackWidth))
-                curve.setZValue(self.ELEMENTS_Z_VALUES['GROUND_TRACK'])
-                self.objectGroundTracks[noradIndex].append(curve)
-                self.plot.addItem(self.objectGroundTracks[noradIndex][-1])
-            # GROUND TRACK ARROW
-            lastLongitude, lastLatitude = groundSegments[-1]
-            x0, y0 = self._lonlatToCartesian(lastLongitude[-2], lastLatitude[-2])
-            x1, y1 = self._lonlatToCartesian(lastLongitude[-1], lastLatitude[-1])
-            length = np.hypot(x1 - x0, y1 - y0)
-            angle = self._arrowAngle(x0, y0, x1, y1)
-            if noradIndex not in self.objectArrows:
-                arrow = pg.ArrowItem(angle=angle, tipAngle=30, headLen=length, tailLen=0, tailWidth=0, pen=pg.mkPen(groundTrackColor), brush=pg.mkBrush(groundTrackColor), pxMode=False)
-                arrow.setZValue(self.ELEMENTS_Z_VALUES['GROUND_TRACK'])
-                self.objectArrows[noradIndex] = arrow
-                self.plot.addItem(self.objectArrows[noradIndex])
-            self.objectArrows[noradIndex].setStyle(angle=angle)
-            self.objectArrows[noradIndex].setPos(x1, y1)
+            if 'GROUND_TRACK' in noradPosition:
+                groundLongitudes, groundLatitudes = noradPosition['GROUND_TRACK']['LONGITUDE'], noradPosition['GROUND_TRACK']['LATITUDE']
+                groundSegments = self._splitWrapSegment(groundLongitudes, groundLatitudes)
+                for item in self.objectGroundTracks.get(noradIndex, []):
+                    self.plot.removeItem(item)
+                self.objectGroundTracks[noradIndex] = []
+                for segmentLongitudes, segmentLatitudes in groundSegments:
+                    gx, gy = self._lonlatToCartesian(segmentLongitudes, segmentLatitudes)
+                    curve = pg.PlotCurveItem(gx, gy, pen=pg.mkPen(groundTrackColor, width=groundTrackWidth))
+                    curve.setZValue(self.ELEMENTS_Z_VALUES['GROUND_TRACK'])
+                    self.objectGroundTracks[noradIndex].append(curve)
+                    self.plot.addItem(self.objectGroundTracks[noradIndex][-1])
+                # GROUND TRACK ARROW
+                lastLongitude, lastLatitude = groundSegments[-1]
+                x0, y0 = self._lonlatToCartesian(lastLongitude[-2], lastLatitude[-2])
+                x1, y1 = self._lonlatToCartesian(lastLongitude[-1], lastLatitude[-1])
+                length = np.hypot(x1 - x0, y1 - y0)
+                angle = self._arrowAngle(x0, y0, x1, y1)
+                if noradIndex not in self.objectArrows:
+                    arrow = pg.ArrowItem(angle=angle, tipAngle=30, headLen=length, tailLen=0, tailWidth=0, pen=pg.mkPen(groundTrackColor), brush=pg.mkBrush(groundTrackColor), pxMode=False)
+                    arrow.setZValue(self.ELEMENTS_Z_VALUES['GROUND_TRACK'])
+                    self.objectArrows[noradIndex] = arrow
+                    self.plot.addItem(self.objectArrows[noradIndex])
+                self.objectArrows[noradIndex].setStyle(angle=angle)
+                self.objectArrows[noradIndex].setPos(x1, y1)
         else:
             self._removeItems(self.objectGroundTracks.get(noradIndex))
             self._removeItems(self.objectArrows.get(noradIndex))
@@ -638,17 +692,18 @@ class Map2dWidget(QWidget):
         # VISIBILITY FOOTPRINT
         footColor, footWidth = noradObjectConfiguration['FOOTPRINT']['COLOR'], noradObjectConfiguration['FOOTPRINT']['WIDTH']
         if self._shouldRender(noradObjectConfiguration['FOOTPRINT']['MODE'], isSelected, self.displayConfiguration['SHOW_FOOTPRINT']):
-            footLongitudes, footLatitudes = noradPosition['VISIBILITY']['LONGITUDE'], noradPosition['VISIBILITY']['LATITUDE']
-            footSegments = self._splitWrapSegment(footLongitudes, footLatitudes)
-            for item in self.objectFootprints.get(noradIndex, []):
-                self.plot.removeItem(item)
-            self.objectFootprints[noradIndex] = []
-            for segmentLongitudes, segmentLatitudes in footSegments:
-                fx, fy = self._lonlatToCartesian(segmentLongitudes, segmentLatitudes)
-                curve = pg.PlotCurveItem(fx, fy, pen=pg.mkPen(footColor, width=footWidth))
-                curve.setZValue(self.ELEMENTS_Z_VALUES['FOOTPRINT'])
-                self.objectFootprints[noradIndex].append(curve)
-                self.plot.addItem(self.objectFootprints[noradIndex][-1])
+            if 'VISIBILITY' in noradPosition:
+                footLongitudes, footLatitudes = noradPosition['VISIBILITY']['LONGITUDE'], noradPosition['VISIBILITY']['LATITUDE']
+                footSegments = self._splitWrapSegment(footLongitudes, footLatitudes)
+                for item in self.objectFootprints.get(noradIndex, []):
+                    self.plot.removeItem(item)
+                self.objectFootprints[noradIndex] = []
+                for segmentLongitudes, segmentLatitudes in footSegments:
+                    fx, fy = self._lonlatToCartesian(segmentLongitudes, segmentLatitudes)
+                    curve = pg.PlotCurveItem(fx, fy, pen=pg.mkPen(footColor, width=footWidth))
+                    curve.setZValue(self.ELEMENTS_Z_VALUES['FOOTPRINT'])
+                    self.objectFootprints[noradIndex].append(curve)
+                    self.plot.addItem(self.objectFootprints[noradIndex][-1])
         else:
             self._removeItems(self.objectFootprints.get(noradIndex))
             self.objectFootprints.pop(noradIndex, None)
@@ -768,11 +823,9 @@ class ObjectListDockWidget(QDockWidget):
         self.database = database
         self.listWidget.clear()
         for norad in selectedNoradIds:
-            row = database.dataFrame[database.dataFrame['NORAD_CAT_ID'] == norad]
-            if row.empty:
+            if not database.hasObject(norad):
                 continue
-            row = row.iloc[0]
-            item = QListWidgetItem(row['OBJECT_NAME'])
+            item = QListWidgetItem(database.getObjectName(norad))
             item.setData(Qt.UserRole, norad)
             self.listWidget.addItem(item)
 
@@ -820,11 +873,9 @@ class ObjectListDockWidget(QDockWidget):
         for norad in noradIndices:
             if any(item.data(Qt.UserRole) == norad for item, _ in self._items):
                 continue
-            try:
-                row = database.dataFrame.loc[database.dataFrame['NORAD_CAT_ID'] == norad].iloc[0]
-            except IndexError:
+            if not database.hasObject(norad):
                 continue
-            item = QListWidgetItem(row['OBJECT_NAME'])
+            item = QListWidgetItem(database.getObjectName(norad))
             item.setData(Qt.UserRole, norad)
             self.listWidget.addItem(item)
             self._items.append((item, None))
@@ -1059,7 +1110,9 @@ class Object2dMapConfigDockWidget(QDockWidget):
 
 class CentralViewWidget(QWidget):
     tabChanged = pyqtSignal(int)
+    computeRequested = pyqtSignal(datetime, dict)
     TABS = {0: '2D_MAP', 1: '3D_VIEW'}
+    SEGMENT_REAL_DURATION = 0.5  # <<< WALL-CLOCK SECONDS OF 3D VIEW INTERPOLATION SHIPPED WITH EACH WORKER TICK
 
     def __init__(self, parent=None, icons=None, currentTab='2D_MAP', currentDir=None):
         super().__init__(parent)
@@ -1070,7 +1123,8 @@ class CentralViewWidget(QWidget):
         self.workerThread = QThread(self)
         self.orbitWorker = OrbitWorker(None)
         self.orbitWorker.moveToThread(self.workerThread)
-        self.clock.timeChanged.connect(self.orbitWorker.compute)
+        self.computeRequested.connect(self.orbitWorker.requestCompute, Qt.DirectConnection)
+        self.orbitWorker.segmentDuration = max(1.0, self.clock.speed * self.SEGMENT_REAL_DURATION)
         self.workerThread.start()
 
         # TIMELINE WIDGET
@@ -1088,11 +1142,12 @@ class CentralViewWidget(QWidget):
         self.activeObjects = set()
         self.selectedObject = None
         self.display2dMapConfiguration, self.display3dViewConfiguration = {}, {}
-        self.lastPositions = {}
+        self.lastPositions, self.renderDemand = {}, {'VIEWS': set(), 'SELECTED': None, 'OBJECTS': {}}
 
         # MAIN TABS
         self.map2dWidget = Map2dWidget()
         self.view3dWidget = View3dWidget()
+        self.view3dWidget.setClock(self.clock)
         self.tabWidget = QTabWidget()
         self.tabWidget.addTab(self.map2dWidget, '2D MAP')
         self.tabWidget.addTab(self.view3dWidget, '3D VIEW')
@@ -1102,6 +1157,7 @@ class CentralViewWidget(QWidget):
         self.tabWidget.currentChanged.connect(self._onTabChanged)
         self.map2dVisible = (self.tabWidget.currentWidget() is self.map2dWidget)
         self.view3dVisible = (self.tabWidget.currentWidget() is self.view3dWidget)
+        self._updateRenderDemand()
 
         # MAIN LAYOUT
         layout = QVBoxLayout(self)
@@ -1112,12 +1168,33 @@ class CentralViewWidget(QWidget):
     def _onTabChanged(self, index):
         self.map2dVisible = (self.tabWidget.currentWidget() is self.map2dWidget)
         self.view3dVisible = (self.tabWidget.currentWidget() is self.view3dWidget)
+        self._updateRenderDemand()
         if self.map2dVisible:
             self._refresh2dMap()
         if self.view3dVisible:
             self._refresh3dView()
         self.tabChanged.emit(index)
 
+    def _updateRenderDemand(self):
+        views, objects = set(), {}
+        if self.map2dVisible and self.display2dMapConfiguration:
+            views.add('2D_MAP')
+        if self.view3dVisible and self.display3dViewConfiguration:
+            views.add('3D_VIEW')
+        for noradIndex in self.activeObjects:
+            isSelected = (noradIndex == self.selectedObject)
+            objectDemand = {'GROUND_TRACK': False, 'FOOTPRINT': False, 'ORBIT': False}
+            if '2D_MAP' in views and str(noradIndex) in self.display2dMapConfiguration['OBJECTS']:
+                objectConfiguration = self.display2dMapConfiguration['OBJECTS'][str(noradIndex)]
+                objectDemand['GROUND_TRACK'] = Map2dWidget._shouldRender(objectConfiguration['GROUND_TRACK']['MODE'], isSelected, self.display2dMapConfiguration['SHOW_GROUND_TRACK'])
+                objectDemand['FOOTPRINT'] = Map2dWidget._shouldRender(objectConfiguration['FOOTPRINT']['MODE'], isSelected, self.display2dMapConfiguration['SHOW_FOOTPRINT'])
+            if '3D_VIEW' in views and str(noradIndex) in self.display3dViewConfiguration['OBJECTS']:
+                objectConfiguration = self.display3dViewConfiguration['OBJECTS'][str(noradIndex)]
+                objectDemand['ORBIT'] = View3dWidget._shouldRender(objectConfiguration['ORBIT']['MODE'], isSelected, self.display3dViewConfiguration['SHOW_ORBITS'])
+            objects[noradIndex] = objectDemand
+        self.renderDemand = {'VIEWS': views, 'SELECTED': self.selectedObject, 'OBJECTS': objects}
+        self.computeRequested.emit(self.clock.currentTime, self.renderDemand)
+
     def _onPositionsReady(self, positions: dict):
         self.lastPositions = positions
         if self.map2dVisible:
@@ -1128,30 +1205,37 @@ class CentralViewWidget(QWidget):
     def setDatabase(self, database):
         self.orbitWorker.database = database
 
+    def setProcessCount(self, nbProcesses, poolThreshold=500):
+        self.orbitWorker.setProcessCount(nbProcesses, poolThreshold)
+
     def setSelectedObject(self, noradIndex):
         self.selectedObject = noradIndex
+        self._updateRenderDemand()
         self._refresh2dMap()
 
     def setActiveObjects(self, noradIndices):
         self.activeObjects = set(noradIndices)
         self.orbitWorker.noradIndices = list(self.activeObjects)
+        self._updateRenderDemand()
         self._refresh2dMap()
         self._refresh3dView()
 
     def set2dMapConfiguration(self, displayConfiguration):
         self.display2dMapConfiguration = displayConfiguration
+        self._updateRenderDemand()
         self._refresh2dMap()
 
     def set3dViewConfiguration(self, displayConfiguration):
         self.display3dViewConfiguration = displayConfiguration
+        self._updateRenderDemand()
         self._refresh3dView()
 
     def _refresh2dMap(self):
-        if self.map2dVisible and self.lastPositions:
+        if self.map2dVisible and '2D_MAP' in self.lastPositions:
             self.map2dWidget.updateMap(self.lastPositions, self.activeObjects, self.selectedObject, self.display2dMapConfiguration)
 
     def _refresh3dView(self):
-        if self.view3dVisible and self.lastPositions:
+        if self.view3dVisible and '3D_VIEW' in self.lastPositions:
             self.view3dWidget.updateData(self.lastPositions, self.activeObjects, self.selectedObject, self.display3dViewConfiguration)
 
     def start(self):
@@ -1159,9 +1243,11 @@ class CentralViewWidget(QWidget):
 
     def _onClockTimeChanged(self, simTime: datetime):
         self.timeline.setTime(simTime)
+        self.computeRequested.emit(simTime, self.renderDemand)
 
     def _onSpeedRequested(self, speed):
         self.clock.setSpeed(speed)
+        self.orbitWorker.segmentDuration = max(1.0, self.clock.speed * self.SEGMENT_REAL_DURATION)
 
     def _jumpToNow(self):
         now = datetime.utcnow()
@@ -1172,4 +1258,5 @@ class CentralViewWidget(QWidget):
         self.orbitWorker.stop()
         self.workerThread.quit()
         self.workerThread.wait()
+        self.orbitWorker.closePool()
         super().closeEvent(event)
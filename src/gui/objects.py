@@ -1,13 +1,16 @@
 import os
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 import numpy as np
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal, QSize
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot, QSize
 from PyQt5.QtGui import QIcon, QPainter, QPen
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import Qt, QRect
 
 from src.core.orbitalEngine import OrbitalMechanicsEngine
+from src.core.orbitPathCache import OrbitPathCache
+from src.core.propagationPool import PropagationPool
 
 
 class SimulationClock(QObject):
@@ -36,6 +39,12 @@ class SimulationClock(QObject):
         self.currentTime += simDelta
         self.timeChanged.emit(self.currentTime)
 
+    def estimateTime(self):
+        # SIMULATION TIME AT THIS INSTANT, BETWEEN TWO CLOCK TICKS
+        if not self.running:
+            return self.currentTime
+        return self.currentTime + timedelta(seconds=(datetime.utcnow() - self._lastRealTime).total_seconds() * self.speed)
+
     def play(self):
         self._lastRealTime = datetime.utcnow()
         self.running = True
@@ -60,38 +69,161 @@ class SimulationClock(QObject):
 
 class OrbitWorker(QObject):
     positionsReady = pyqtSignal(dict)
+    _wakeRequested = pyqtSignal()
 
     def __init__(self, database):
         super().__init__()
         self.engine = OrbitalMechanicsEngine()
+        self.pathCache = OrbitPathCache(self.engine, nbPoints=361, nbPast=0.5, nbFuture=0.5)
         self.database = database
         self.noradIndices = []
+        self.renderDemand = None
+        self.propagationPool, self.poolThreshold = None, 500
+        self.segmentDuration = 1.0  # <<< SIMULATED SECONDS COVERED BY THE 3D VIEW INTERPOLATION SEGMENTS
+        self._tickSegmentDuration = self.segmentDuration
         self._running = True
+        # LATEST-WINS TICK SCHEDULING
+        self.processedTicks, self.skippedTicks = 0, 0
+        self._pendingRequest, self._requestLock = None, threading.Lock()
+        self._wakeRequested.connect(self._processPendingRequest, Qt.QueuedConnection)
 
     def stop(self):
         self._running = False
 
-    def compute(self, simulationTime: datetime):
-        if not self._running or self.database is None:
+    def setProcessCount(self, nbProcesses: int, poolThreshold: int = 500):
+        if self.propagationPool is not None:
+            self.propagationPool.close()
+            self.propagationPool = None
+        self.poolThreshold = poolThreshold
+        if nbProcesses > 1:
+            self.propagationPool = PropagationPool(nbProcesses, maxSamples=2)
+
+    def closePool(self):
+        self.setProcessCount(0)
+
+    def requestCompute(self, simulationTime: datetime, renderDemand: dict = None):
+        with self._requestLock:
+            wakeWorker = self._pendingRequest is None
+            if not wakeWorker:
+                self.skippedTicks += 1
+                renderDemand = self._pendingRequest[1] if renderDemand is None else renderDemand
+            self._pendingRequest = (simulationTime, renderDemand)
+        if wakeWorker:
+            self._wakeRequested.emit()
+
+    @pyqtSlot()
+    def _processPendingRequest(self):
+        with self._requestLock:
+            request, self._pendingRequest = self._pendingRequest, None
+        if request is None:
             return
+        # ONLY TICKS THAT ACTUALLY PROPAGATED COUNT AS PROCESSED
+        if self.compute(*request):
+            with self._requestLock:
+                self.processedTicks += 1
+
+    def tickStatistics(self):
+        with self._requestLock:
+            return {'PROCESSED': self.processedTicks, 'SKIPPED': self.skippedTicks, 'PENDING': self._pendingRequest is not None}
+
+    @staticmethod
+    def _objectDemand(renderDemand, noradIndex):
+        if renderDemand is None:
+            return {'GROUND_TRACK': True, 'FOOTPRINT': True, 'ORBIT': True}
+        return renderDemand['OBJECTS'].get(noradIndex, {'GROUND_TRACK': False, 'FOOTPRINT': False, 'ORBIT': False})
+
+    def compute(self, simulationTime: datetime, renderDemand: dict = None):
+        if renderDemand is not None:
+            self.renderDemand = renderDemand
+        if not self._running or self.database is None:
+            return False
         results = {}
-        # FLAT 2D MAP CALCULATIONS
-        map2dResults = {'OBJECTS' : {noradIndex: {'NAME': self.database.getObjectName(noradIndex)} for noradIndex in self.noradIndices}}
-        for noradIndex in self.noradIndices:
+        visibleViews = {'2D_MAP', '3D_VIEW'} if self.renderDemand is None else self.renderDemand['VIEWS']
+        if not visibleViews:
+            return False
+        states = self._computeStates(simulationTime)
+        if '2D_MAP' in visibleViews:
+            results['2D_MAP'] = self._computeMap2dResults(simulationTime, states)
+        if '3D_VIEW' in visibleViews:
+            results['3D_VIEW'] = self._computeView3dResults(simulationTime, states)
+        # RESULTS EMISSION
+        self.positionsReady.emit(results)
+        return True
+
+    def _computeStates(self, simulationTime: datetime):
+        pathNorads = [noradIndex for noradIndex in self.noradIndices if self._needsPath(self._objectDemand(self.renderDemand, noradIndex))]
+        self.pathCache.retain(pathNorads)
+        database = self.database  # <<< ONE CATALOG PER TICK, EVEN IF A NEWER ONE IS PUBLISHED MEANWHILE
+        known = database.hasObjects(self.noradIndices)
+        for noradIndex in np.asarray(self.noradIndices)[~known].tolist():
+            print(f"Worker error {noradIndex}: unknown object")
+        # ELEMENT SETS WITH THE EPOCH CLOSEST TO THE SIMULATION TIME
+        noradIndices = [noradIndex for noradIndex, isKnown in zip(self.noradIndices, known) if isKnown]
+        # TRACKED SET PLUS AS MANY ARCHIVED ELEMENT SETS, ALL KEPT ACROSS TICKS
+        database.satrecCache.reserve(2 * len(noradIndices))
+        satellites = database.getSatrecs(noradIndices, simulationTime)
+        # BATCH PROPAGATION & FRAME CONVERSIONS, SEGMENT END AS A SECOND SAMPLE WHEN THE 3D VIEW IS SHOWN
+        visibleViews = {'2D_MAP', '3D_VIEW'} if self.renderDemand is None else self.renderDemand['VIEWS']
+        self._tickSegmentDuration = self.segmentDuration  # <<< ONE DURATION PER TICK, EVEN IF THE GUI CHANGES IT MEANWHILE
+        offsets = np.array([0.0, self._tickSegmentDuration] if '3D_VIEW' in visibleViews else [0.0])
+        julianDates, fractions = self.engine.datetimeToJdArray(simulationTime, offsets)
+        julianDate, fraction = julianDates[0], fractions[0]
+        if self.propagationPool is not None and len(satellites) >= self.poolThreshold:
+            positionsEci, velocitiesEci, errors = self._propagateWithPool(database, noradIndices, simulationTime, julianDates, fractions)
+        else:
+            positionsEci, velocitiesEci, errors = self.engine.propagateSgp4Batch(satellites, julianDates, fractions)
+        segments = self._hermiteSegments(positionsEci, velocitiesEci, errors, self._tickSegmentDuration) if offsets.size > 1 else None
+        positionsEci, velocitiesEci, errors = positionsEci[:, 0], velocitiesEci[:, 0], errors[:, 0]
+        positionsEcef = self.engine.rotateAboutZ(positionsEci, self.engine.julianDateToGmst(julianDate, fraction))
+        longitudes, latitudes, altitudes = self.engine.ecefToLongitudeLatitude(positionsEcef)
+        names = database.getObjectNames(noradIndices)
+        states = {}
+        for i, (noradIndex, satellite) in enumerate(zip(noradIndices, satellites)):
+            if errors[i] != 0:
+                print(f"Worker error {noradIndex}: SGP4 error code {errors[i]}")
+                continue
             try:
-                # MAP CALCULATIONS
-                satellite = self.database.getSatrec(noradIndex)
-                state = self.engine.satelliteState(satellite, simulationTime)
-                groundLongitudes, groundLatitudes, groundElevations = self.engine.satelliteGroundTrack(satellite, simulationTime)
-                visibilityLongitudes, visibilityLatitudes = self.engine.satelliteVisibilityFootPrint(state, nbPoints=361)
-                longitude, latitude = np.rad2deg(state['longitude']), np.rad2deg(state['latitude'])
-                groundLongitudes, groundLatitudes = np.rad2deg(groundLongitudes), np.rad2deg(groundLatitudes)
-                visibilityLongitudes, visibilityLatitudes = np.rad2deg(visibilityLongitudes), np.rad2deg(visibilityLatitudes)
-                map2dResults['OBJECTS'][noradIndex]['POSITION'] =  {'LONGITUDE': longitude, 'LATITUDE': latitude}
-                map2dResults['OBJECTS'][noradIndex]['GROUND_TRACK'] = {'LONGITUDE': groundLongitudes, 'LATITUDE': groundLatitudes}
-                map2dResults['OBJECTS'][noradIndex]['VISIBILITY'] = {'LONGITUDE': visibilityLongitudes, 'LATITUDE': visibilityLatitudes}
+                state = {'rECI': positionsEci[i], 'vECI': velocitiesEci[i], 'rECEF': positionsEcef[i], 'altitude': altitudes[i], 'latitude': latitudes[i], 'longitude': longitudes[i]}
+                path = self.pathCache.getPath(noradIndex, satellite, julianDate, fraction) if noradIndex in pathNorads else None
+                states[noradIndex] = {'NAME': names[i], 'STATE': state, 'PATH': path, 'SEGMENT': segments[i] if segments is not None else None}
             except Exception as e:
                 print(f"Worker error {noradIndex}: {e}")
+        return states
+
+    @staticmethod
+    def _hermiteSegments(positions, velocities, errors, duration):
+        # CUBIC HERMITE POLYNOMIALS IN THE NORMALIZED SEGMENT TIME U = (T - T0) / DURATION : (N, 4, 3) COEFFICIENTS, LOWEST DEGREE FIRST
+        startPositions, endPositions = positions[:, 0], positions[:, 1]
+        startVelocities, endVelocities = duration * velocities[:, 0], duration * velocities[:, 1]
+        delta = endPositions - startPositions
+        segments = np.stack((startPositions, startVelocities, 3 * delta - 2 * startVelocities - endVelocities, startVelocities + endVelocities - 2 * delta), axis=1)
+        # FAILED SEGMENT END : OBJECT HELD AT ITS START POSITION
+        segments[errors[:, 1] != 0, 1:] = 0.0
+        return segments
+
+    def _propagateWithPool(self, database, noradIndices, simulationTime, julianDates, fractions):
+        # POOL CATALOG RELOADED ONLY WHEN THE OBJECTS OR THEIR SELECTED ELEMENT SETS CHANGE
+        catalogKey = np.stack((np.asarray(noradIndices, dtype=np.float64), database.getEpochs(noradIndices, simulationTime)))
+        if self.propagationPool.catalogKey is None or not np.array_equal(catalogKey, self.propagationPool.catalogKey):
+            self.propagationPool.setCatalog(noradIndices, [database.getTleLines(noradIndex, simulationTime) for noradIndex in noradIndices], catalogKey)
+        return self.propagationPool.propagate(julianDates, fractions)
+
+    def _needsPath(self, objectDemand):
+        visibleViews = {'2D_MAP', '3D_VIEW'} if self.renderDemand is None else self.renderDemand['VIEWS']
+        return ('2D_MAP' in visibleViews and objectDemand['GROUND_TRACK']) or ('3D_VIEW' in visibleViews and objectDemand['ORBIT'])
+
+    def _computeMap2dResults(self, simulationTime: datetime, states: dict):
+        # FLAT 2D MAP CALCULATIONS
+        map2dResults = {'OBJECTS': {}}
+        for noradIndex, objectState in states.items():
+            state, path, objectDemand = objectState['STATE'], objectState['PATH'], self._objectDemand(self.renderDemand, noradIndex)
+            objectResults = {'NAME': objectState['NAME'], 'POSITION': {'LONGITUDE': np.rad2deg(state['longitude']), 'LATITUDE': np.rad2deg(state['latitude'])}}
+            if objectDemand['GROUND_TRACK'] and path is not None:
+                objectResults['GROUND_TRACK'] = {'LONGITUDE': np.rad2deg(path['LONGITUDE']), 'LATITUDE': np.rad2deg(path['LATITUDE'])}
+            if objectDemand['FOOTPRINT']:
+                visibilityLongitudes, visibilityLatitudes = self.engine.satelliteVisibilityFootPrint(state, nbPoints=361)
+                objectResults['VISIBILITY'] = {'LONGITUDE': np.rad2deg(visibilityLongitudes), 'LATITUDE': np.rad2deg(visibilityLatitudes)}
+            map2dResults['OBJECTS'][noradIndex] = objectResults
         # SUN POSITION AND TERMINATOR CALCULATION
         sunLongitude, sunLatitude, sunDistance = self.engine.subSolarPoint(simulationTime, radians=False)
         terminatorLongitudes, terminatorLatitudes = self.engine.terminatorCurve(simulationTime, nbPoints=361, radians=False)
@@ -99,28 +231,27 @@ class OrbitWorker(QObject):
         map2dResults['SUN'] = {'LONGITUDE': sunLongitude, 'LATITUDE': sunLatitude, 'DISTANCE': sunDistance}
         map2dResults['NIGHT'] = {'LONGITUDE': terminatorLongitudes, 'LATITUDE': terminatorLatitudes}
         map2dResults['VERNAL'] = {'LONGITUDE': vernalLongitude, 'LATITUDE': vernalLatitude}
-        results['2D_MAP'] = map2dResults
+        return map2dResults
+
+    def _computeView3dResults(self, simulationTime: datetime, states: dict):
         # 3D EARTH VIEW CALCULATIONS
-        earth3dResults = {'OBJECTS': {noradIndex: {'NAME': self.database.getObjectName(noradIndex)} for noradIndex in self.noradIndices}}
-        for noradIndex in self.noradIndices:
-            try:
-                satellite = self.database.getSatrec(noradIndex)
-                state = self.engine.satelliteState(satellite, simulationTime)
-                # INSTANT POSITION
-                rEci, vEci = state['rECI'], state['vECI']
-                earth3dResults['OBJECTS'][noradIndex]['POSITION'] = {'R_ECI': rEci, 'V_ECI': vEci, 'ALTITUDE': state['altitude'], 'LATITUDE': np.rad2deg(state['latitude']), 'LONGITUDE': np.rad2deg(state['longitude'])}
-                # ORBIT PATH
-                positionsEci = self.engine.satelliteOrbitPath(satellite, simulationTime, nbPoints=361, nbPast=0.5, nbFuture=0.5)
-                earth3dResults['OBJECTS'][noradIndex]['ORBIT_PATH'] = positionsEci
-            except Exception as e:
-                print(f"Worker error {noradIndex}: {e}")
+        earth3dResults = {'OBJECTS': {}}
+        for noradIndex, objectState in states.items():
+            state, path, objectDemand = objectState['STATE'], objectState['PATH'], self._objectDemand(self.renderDemand, noradIndex)
+            earth3dResults['OBJECTS'][noradIndex] = {
+                'NAME': objectState['NAME'],
+                'POSITION': {'R_ECI': state['rECI'], 'V_ECI': state['vECI'], 'ALTITUDE': state['altitude'], 'LATITUDE': np.rad2deg(state['latitude']), 'LONGITUDE': np.rad2deg(state['longitude'])},
+            }
+            if objectDemand['ORBIT'] and path is not None:
+                earth3dResults['OBJECTS'][noradIndex]['ORBIT_PATH'] = path['ECI']
+            if objectState['SEGMENT'] is not None:
+                earth3dResults['OBJECTS'][noradIndex]['SEGMENT'] = objectState['SEGMENT']
         # GMST FOR 3D VIEW
         earth3dResults['GMST'] = self.engine.greenwichMeridianSiderealTime(simulationTime)
+        earth3dResults['SEGMENT_START'], earth3dResults['SEGMENT_DURATION'] = simulationTime, self._tickSegmentDuration
         earth3dResults['SUN_DIRECTION_ECI'] = self.engine.solarDirectionEci(simulationTime)
         earth3dResults['SUN_DIRECTION_ECEF'] =  self.engine.eciToEcef(earth3dResults['SUN_DIRECTION_ECI'], simulationTime)
-        results['3D_VIEW'] = earth3dResults
-        # RESULTS EMISSION
-        self.positionsReady.emit(results)
+        return earth3dResults
 
 
 class AddObjectDialog(QDialog):
@@ -156,9 +287,10 @@ class AddObjectDialog(QDialog):
 
     def _populate(self):
         self.listWidget.clear()
-        rows = self.database.dataFrame.sort_values('OBJECT_NAME')
-        for _, row in rows.iterrows():
-            name, noradIndex = row['OBJECT_NAME'], row['NORAD_CAT_ID']
+        catalog = self.database.catalog
+        names = catalog.names()
+        for position in sorted(range(len(names)), key=names.__getitem__):
+            name, noradIndex = names[position], int(catalog.noradIndices[position])
             text = f'{name} — {noradIndex}'
             item = QListWidgetItem(text)
             item.setData(Qt.UserRole, noradIndex)
@@ -28,4 +28,4 @@ class LoadingScreen(QSplashScreen):
     def launchMainWindow(self, mainWindow):
         self.mainWindow = mainWindow
         self.finish(mainWindow)
-        mainWindow.show()
\ No newline at end of file
+        mainWindow.showRestored()
\ No newline at end of file